@@ -38,6 +38,14 @@ flags.DEFINE_bool(
 )
 flags.DEFINE_integer("sim_n", 39, "Number of benchmark programs to simulate.")
 flags.DEFINE_integer("sim_seed", 1, "Random seed for simulation benchmark.")
+flags.DEFINE_integer(
+    "jobs",
+    None,
+    (
+        "Worker processes for the precondition redundancy sweeps and the "
+        "simulation benchmark (default: all CPUs; 1 runs them sequentially)."
+    ),
+)
 flags.DEFINE_bool(
     "group",
     False,
@@ -48,7 +56,9 @@ flags.DEFINE_bool(
 def main(argv: list[str]) -> None:
     """Runs bounded redundancy checks or the simulation benchmark."""
     if FLAGS.simulate:
-        report = simulation.run_simulation(num_programs=FLAGS.sim_n, seed=FLAGS.sim_seed)
+        report = simulation.run_simulation(
+            num_programs=FLAGS.sim_n, seed=FLAGS.sim_seed, jobs=FLAGS.jobs
+        )
         simulation.write_outputs(
             report=report,
             json_path=Path("outputs/simulation_report.json"),
@@ -68,6 +78,7 @@ def main(argv: list[str]) -> None:
     exit_code = redundancy_checker.analyze(
         Path(spec),
         step_limit_override=FLAGS.step_limit,
+        jobs=FLAGS.jobs,
     )
     if exit_code == 0 and FLAGS.group:
         import json
@@ -87,6 +98,7 @@ def main(argv: list[str]) -> None:
             post=post,
             input_ranges=input_ranges,
             step_limit=step_limit,
+            jobs=FLAGS.jobs,
         )
         out = Path("outputs/group_redundancy_report.json")
         out.parent.mkdir(parents=True, exist_ok=True)
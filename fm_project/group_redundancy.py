@@ -24,24 +24,21 @@ class GroupRedundancyReport:
     counterexample_if_not_group: dict[str, int] | None
 
 
-def _holds(
-    *,
-    program: list[dict[str, Any]],
-    pre: list[str],
-    post: list[str],
-    input_ranges: dict[str, dict[str, int]],
-    step_limit: int,
-) -> bool:
-    rr = redundancy_checker.run_contract(
-        program=program,
-        pre=pre,
-        post=post,
-        input_ranges=input_ranges,
-        step_limit=step_limit,
-    )
+def _holds(rr: redundancy_checker.RunResult) -> bool:
     return rr.violations == 0 and rr.nontermination == 0
 
 
+def _implied(
+    antecedent: list[str], consequent: str, input_ranges: dict[str, dict[str, int]]
+) -> bool:
+    try:
+        return redundancy_checker.implies_bounded(
+            antecedent=antecedent, consequent=consequent, input_ranges=input_ranges
+        )
+    except Exception:  # pylint: disable=broad-except
+        return False  # let the contract run report the failure
+
+
 def analyze_group_redundancy(
     *,
     program: list[dict[str, Any]],
@@ -49,50 +46,95 @@ def analyze_group_redundancy(
     post: list[str],
     input_ranges: dict[str, dict[str, int]],
     step_limit: int,
+    jobs: int | None = None,
 ) -> GroupRedundancyReport:
-    """Computes single redundancy and a greedy group-redundant set."""
-    single: list[int] = []
-    for i in range(len(pre)):
-        reduced = [p for j, p in enumerate(pre) if j != i]
-        if _holds(
-            program=program,
-            pre=reduced,
-            post=post,
-            input_ranges=input_ranges,
-            step_limit=step_limit,
-        ):
-            single.append(i)
-
-    # Greedy maximal removable set (a group that can be removed together).
-    remaining = list(range(len(pre)))
-    removed: list[int] = []
-    changed = True
-    while changed:
-        changed = False
-        for i in list(remaining):
-            trial = [pre[j] for j in remaining if j != i]
-            if _holds(
+    """Computes single redundancy and a greedy group-redundant set.
+
+    `jobs` bounds the worker processes used for the contract runs (default:
+    all CPUs; 1 runs everything sequentially).
+    """
+    # Contract verdicts keyed by the indices of the preconditions kept. The
+    # greedy passes revisit many subsets (its first pass repeats the single
+    # checks), so each distinct subset is only run once.
+    verdicts: dict[frozenset[int], bool] = {}
+    first_failures: dict[frozenset[int], dict[str, int] | None] = {}
+
+    with redundancy_checker.process_pool(jobs) as executor:
+
+        def holds_each(subsets: list[frozenset[int]]) -> list[bool]:
+            missing = list(dict.fromkeys(k for k in subsets if k not in verdicts))
+            runs = redundancy_checker.run_contract_sweep(
                 program=program,
-                pre=trial,
+                pre_variants=[[pre[j] for j in sorted(k)] for k in missing],
                 post=post,
                 input_ranges=input_ranges,
                 step_limit=step_limit,
-            ):
-                remaining.remove(i)
-                removed.append(i)
+                executor=executor,
+            )
+            for k, rr in zip(missing, runs, strict=True):
+                verdicts[k] = _holds(rr)
+                first_failures[k] = rr.first_failure
+            return [verdicts[k] for k in subsets]
+
+        def prune(kept: frozenset[int], dropped: list[int]) -> None:
+            # Dropping a repeat of an earlier kept precondition changes no
+            # evaluation, so the verdict carries over. If `kept` holds and the
+            # other kept preconditions imply pre[i], dropping it accepts the
+            # same inputs, so it holds too (IC pruning).
+            if kept not in verdicts:
+                return
+            for i in dropped:
+                rest = kept - {i}
+                if rest in verdicts:
+                    continue
+                if any(canon[j] == canon[i] for j in rest if j < i):
+                    verdicts[rest] = verdicts[kept]
+                elif verdicts[kept] and _implied(
+                    [pre[j] for j in sorted(rest)], pre[i], input_ranges
+                ):
+                    verdicts[rest] = True
+
+        everything = frozenset(range(len(pre)))
+        holds_each([everything])
+        canon = [redundancy_checker.canonical_expr(p) for p in pre]
+        prune(everything, list(range(len(pre))))
+        single_holds = holds_each([everything - {i} for i in range(len(pre))])
+        single = [i for i, ok in enumerate(single_holds) if ok]
+
+        # Greedy maximal removable set (a group that can be removed together).
+        # Each pass tries the remaining candidates in order and drops every one
+        # whose removal still holds. With a pool, candidates are checked in
+        # parallel waves against the same `remaining`; results after the first
+        # success are stale and are re-checked in the next wave.
+        wave_size = len(pre) if executor is not None else 1
+        remaining = list(range(len(pre)))
+        removed: list[int] = []
+        changed = True
+        while changed:
+            changed = False
+            candidates = list(remaining)
+            while candidates:
+                kept = frozenset(remaining)
+                prune(kept, candidates[:wave_size])
+                wave = holds_each([kept - {i} for i in candidates[:wave_size]])
+                if True not in wave:
+                    candidates = candidates[len(wave) :]
+                    continue
+                k = wave.index(True)
+                remaining.remove(candidates[k])
+                removed.append(candidates[k])
                 changed = True
+                candidates = candidates[k + 1 :]
 
-    all_single_removed = [pre[i] for i in range(len(pre)) if i not in single]
-    all_single_is_group = _holds(
-        program=program,
-        pre=all_single_removed,
-        post=post,
-        input_ranges=input_ranges,
-        step_limit=step_limit,
-    )
+        all_single_kept = everything - set(single)
+        (all_single_is_group,) = holds_each([all_single_kept])
+        all_single_removed = [pre[i] for i in range(len(pre)) if i not in single]
 
     counterexample = None
-    if single and not all_single_is_group:
+    if single and not all_single_is_group and all_single_kept in first_failures:
+        # The contract run already found the first failing input.
+        counterexample = first_failures[all_single_kept]
+    elif single and not all_single_is_group:
         counterexample = redundancy_checker.find_counterexample(
             program=program,
             pre=all_single_removed,
@@ -107,4 +149,3 @@ def analyze_group_redundancy(
         all_single_is_group_redundant=all_single_is_group,
         counterexample_if_not_group=counterexample,
     )
-
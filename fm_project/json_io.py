@@ -0,0 +1,29 @@
+"""JSON reading and writing, through orjson when it is installed.
+
+orjson is optional; without it the stdlib json module is used. Its output
+can differ from json's in float formatting (e.g. `1e-05` vs `1e-5`).
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:  # Optional: orjson parses and pretty-prints JSON in C.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def loads(data: bytes) -> Any:
+    """Parses a UTF-8 JSON document."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_pretty(obj: Any) -> bytes:
+    """Serializes `obj` as 2-space indented UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
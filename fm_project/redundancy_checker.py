@@ -11,11 +11,19 @@ postconditions (within that bounded domain).
 from __future__ import annotations
 
 import ast
+import contextlib
+import functools
 import itertools
 import json
+import keyword
+import math
+import operator
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Iterable
+from types import CodeType
+from typing import Any, Callable, ContextManager, Iterable
 
 
 class UnsafeExpressionError(ValueError):
@@ -49,95 +57,169 @@ _ALLOWED_AST_NODES = (
 )
 
 
-def _ensure_allowed_node(node: ast.AST) -> None:
-    """Validates that an AST contains only safe/allowed nodes."""
-    for sub in ast.walk(node):
-        if not isinstance(sub, _ALLOWED_AST_NODES):
-            raise UnsafeExpressionError(f"Disallowed syntax: {type(sub).__name__}")
+class _BoolOpToBool(ast.NodeTransformer):
+    """Makes `and`/`or` yield bools, matching the language's boolean semantics."""
 
+    def visit_BoolOp(self, node: ast.BoolOp) -> ast.AST:
+        self.generic_visit(node)
+        return ast.copy_location(
+            ast.IfExp(test=node, body=ast.Constant(True), orelse=ast.Constant(False)),
+            node,
+        )
 
-def vars_in_expr(expr: str) -> set[str]:
-    """Returns variable names referenced by an expression."""
+
+class _PrefixNames(ast.NodeTransformer):
+    """Prefixes variable names so they cannot clash with generated locals."""
+
+    def visit_Name(self, node: ast.Name) -> ast.AST:
+        return ast.copy_location(ast.Name(id=_VAR_PREFIX + node.id, ctx=node.ctx), node)
+
+
+# Prefix for spec variables inside generated code (see `_compiled_program`).
+_VAR_PREFIX = "v_"
+
+# Compiled expressions only ever see `env`; no builtins are reachable.
+_EMPTY_GLOBALS: dict[str, Any] = {"__builtins__": {}}
+
+# Errors that count as a contract failure for a single enumerated input.
+_EVAL_ERRORS = (KeyError, NameError, UnsafeExpressionError, ValueError, ZeroDivisionError)
+
+
+@functools.lru_cache(maxsize=None)
+def _compile(expr: str) -> tuple[CodeType, frozenset[str]]:
+    """Parses, validates and compiles an expression once per distinct string.
+
+    A single walk over the tree both rejects disallowed syntax and collects
+    the referenced variable names.
+    """
     tree = ast.parse(expr, mode="eval")
-    _ensure_allowed_node(tree)
     names: set[str] = set()
     for sub in ast.walk(tree):
+        if not isinstance(sub, _ALLOWED_AST_NODES):
+            raise UnsafeExpressionError(f"Disallowed syntax: {type(sub).__name__}")
         if isinstance(sub, ast.Name):
             names.add(sub.id)
-    return names
+    tree = ast.fix_missing_locations(_BoolOpToBool().visit(tree))
+    return compile(tree, "<expr>", "eval"), frozenset(names)
+
+
+def _compile_expr(expr: str) -> CodeType:
+    """Returns the compiled code of an expression."""
+    return _compile(expr)[0]
+
+
+def vars_in_expr(expr: str) -> frozenset[str]:
+    """Returns variable names referenced by an expression."""
+    return _compile(expr)[1]
+
+
+@functools.lru_cache(maxsize=None)
+def canonical_expr(expr: str) -> str:
+    """Returns an expression's normalized source (spacing and parentheses).
+
+    An expression that does not parse is returned as is; it fails when
+    evaluated, and only an identical string can match it.
+    """
+    try:
+        return ast.unparse(ast.parse(expr, mode="eval"))
+    except (SyntaxError, RecursionError):
+        return expr
 
 
 def eval_expr(expr: str, env: dict[str, Any]) -> Any:
     """Safely evaluates a restricted expression over `env`."""
-    tree = ast.parse(expr, mode="eval")
-    _ensure_allowed_node(tree)
-
-    def go(node: ast.AST) -> Any:
-        match node:
-            case ast.Expression(body=body):
-                return go(body)
-            case ast.Constant(value=value):
-                return value
-            case ast.Name(id=name):
-                if name not in env:
-                    raise KeyError(f"Unknown variable: {name}")
-                return env[name]
-            case ast.UnaryOp(op=op, operand=operand):
-                value = go(operand)
-                if isinstance(op, ast.Not):
-                    return not bool(value)
-                if isinstance(op, ast.USub):
-                    return -value
-                if isinstance(op, ast.UAdd):
-                    return +value
-                raise UnsafeExpressionError(f"Unsupported unary op: {type(op).__name__}")
-            case ast.BinOp(left=left, op=op, right=right):
-                a = go(left)
-                b = go(right)
-                if isinstance(op, ast.Add):
-                    return a + b
-                if isinstance(op, ast.Sub):
-                    return a - b
-                if isinstance(op, ast.Mult):
-                    return a * b
-                if isinstance(op, ast.Mod):
-                    return a % b
-                raise UnsafeExpressionError(f"Unsupported bin op: {type(op).__name__}")
-            case ast.BoolOp(op=op, values=values):
-                if isinstance(op, ast.And):
-                    return all(bool(go(v)) for v in values)
-                if isinstance(op, ast.Or):
-                    return any(bool(go(v)) for v in values)
-                raise UnsafeExpressionError(f"Unsupported bool op: {type(op).__name__}")
-            case ast.Compare(left=left, ops=ops, comparators=comparators):
-                current = go(left)
-                for cmp_op, rhs_node in zip(ops, comparators, strict=True):
-                    rhs = go(rhs_node)
-                    ok: bool
-                    if isinstance(cmp_op, ast.Eq):
-                        ok = current == rhs
-                    elif isinstance(cmp_op, ast.NotEq):
-                        ok = current != rhs
-                    elif isinstance(cmp_op, ast.Lt):
-                        ok = current < rhs
-                    elif isinstance(cmp_op, ast.LtE):
-                        ok = current <= rhs
-                    elif isinstance(cmp_op, ast.Gt):
-                        ok = current > rhs
-                    elif isinstance(cmp_op, ast.GtE):
-                        ok = current >= rhs
-                    else:
-                        raise UnsafeExpressionError(
-                            f"Unsupported compare op: {type(cmp_op).__name__}"
-                        )
-                    if not ok:
-                        return False
-                    current = rhs
-                return True
-            case _:
-                raise UnsafeExpressionError(f"Unsupported node: {type(node).__name__}")
+    try:
+        return eval(_compile_expr(expr), _EMPTY_GLOBALS, env)
+    except NameError as exc:
+        raise KeyError(f"Unknown variable: {exc.name}") from None
 
-    return go(tree)
+
+# Per-point predicate outcomes, as characters of a mask string.
+_MASK_TRUE = str.maketrans("1ef", "100")
+_MASK_ERROR = str.maketrans("1ef", "010")
+_MASK_FATAL = str.maketrans("1ef", "001")
+_BIT_SELECTORS = bytes.maketrans(b"01", b"\x00\x01")
+
+
+@functools.lru_cache(maxsize=1024)
+def _predicate_masks(
+    expr: str, names: tuple[str, ...], axes: tuple[range, ...]
+) -> tuple[int, int, int]:
+    """Returns bitmasks of the points where a predicate holds, errs or raises.
+
+    Bit k stands for the k-th point of `_input_grid(axes)` over `names`.
+    "Errs" means one of `_EVAL_ERRORS` (a contract violation); any other
+    exception is recorded as "raises" and re-raised by the caller if reached.
+    Cached, so every contract run over the same projection shares the masks.
+    An expression that does not compile fails alike at every point.
+    """
+    try:
+        code = _compile_expr(expr)
+    except UnsafeExpressionError:
+        return 0, (1 << math.prod(len(r) for r in axes)) - 1, 0
+    except (SyntaxError, RecursionError):
+        return 0, 0, (1 << math.prod(len(r) for r in axes)) - 1
+    used = vars_in_expr(expr)
+    positions = [k for k, name in enumerate(names) if name in used]
+    # Evaluate once per point of the predicate's own inputs, then spread the
+    # outcomes over the projection by looking up each point's own values.
+    outcomes: dict[Any, str] = {}
+    for own_values in itertools.product(*(axes[k] for k in positions)):
+        env = {names[k]: v for k, v in zip(positions, own_values)}
+        try:
+            outcome = "1" if eval(code, _EMPTY_GLOBALS, env) else "0"
+        except _EVAL_ERRORS:
+            outcome = "e"
+        except Exception:  # pylint: disable=broad-except
+            outcome = "f"
+        outcomes[own_values[0] if len(positions) == 1 else own_values] = outcome
+    points = _input_grid(axes)
+    if positions:
+        own_of = operator.itemgetter(*positions)
+        chars = "".join(map(outcomes.__getitem__, map(own_of, points)))
+    else:
+        chars = outcomes[()] * math.prod(len(r) for r in axes)
+    bits = chars[::-1]
+    return (
+        int(bits.translate(_MASK_TRUE), 2),
+        int(bits.translate(_MASK_ERROR), 2),
+        int(bits.translate(_MASK_FATAL), 2),
+    )
+
+
+def _conjoin_masks(
+    exprs: list[str],
+    names: tuple[str, ...],
+    axes: tuple[range, ...],
+    start: tuple[int, int, int] | None = None,
+) -> tuple[int, int, int]:
+    """Conjoins predicates in order over a projection, like a short-circuit `all`.
+
+    Returns the masks of points where all hold, where the first predicate that
+    does not hold errs, and where it raises an unexpected exception. `start`
+    continues from the result for a prefix of the conjunction.
+    """
+    if start is None:
+        start = ((1 << math.prod(len(r) for r in axes)) - 1, 0, 0)
+    accepted, errors, fatal = start
+    for expr in exprs:
+        if not accepted:
+            break  # later predicates are never evaluated; skip their masks
+        true, error, raises = _predicate_masks(expr, names, axes)
+        errors |= accepted & error
+        fatal |= accepted & raises
+        accepted &= true
+    return accepted, errors, fatal
+
+
+def _lowest_point(mask: int, axes: tuple[range, ...]) -> tuple[int, ...]:
+    """Returns the (first in lexicographic order) point of a nonzero mask."""
+    return _input_grid(axes)[(mask & -mask).bit_length() - 1]
+
+
+def _mask_selectors(mask: int) -> bytes:
+    """Returns one 0/1 byte per bit of `mask`, lowest bit first."""
+    return bin(mask)[:1:-1].encode().translate(_BIT_SELECTORS)
 
 
 @dataclass(frozen=True)
@@ -148,101 +230,642 @@ class RunResult:
     satisfying_pre: int
     violations: int
     nontermination: int
+    # The input `find_counterexample` would return (the first failing input
+    # in sorted order), or None if the contract holds.
+    first_failure: dict[str, int] | None = None
 
 
-def _iter_inputs(input_ranges: dict[str, dict[str, int]]) -> Iterable[dict[str, int]]:
-    """Generates all input environments from inclusive integer ranges."""
-    names = sorted(input_ranges.keys())
-    ranges = []
-    for name in names:
+def _input_axes(input_ranges: dict[str, dict[str, int]]) -> dict[str, range]:
+    """Returns the inclusive integer range of each input, keyed in sorted order."""
+    axes: dict[str, range] = {}
+    for name in sorted(input_ranges.keys()):
         spec = input_ranges[name]
         lo = int(spec["min"])
         hi = int(spec["max"])
         if lo > hi:
             raise ValueError(f"Bad range for {name}: min > max")
-        ranges.append(range(lo, hi + 1))
-    for values in itertools.product(*ranges):
-        yield dict(zip(names, values, strict=True))
+        axes[name] = range(lo, hi + 1)
+    return axes
 
 
-def run_contract(
-    *,
-    program: list[dict[str, Any]],
-    pre: list[str],
-    post: list[str],
-    input_ranges: dict[str, dict[str, int]],
-    step_limit: int,
-) -> RunResult:
-    """Executes the program for all bounded inputs and checks the contract."""
-    considered = 0
-    sat_pre = 0
-    violations = 0
-    nonterm = 0
+@functools.lru_cache(maxsize=32)
+def _input_grid(axes: tuple[range, ...]) -> tuple[tuple[int, ...], ...]:
+    """Returns all points of a bounded domain in lexicographic order.
+
+    Built once per domain and shared by every check over it, instead of
+    re-running `itertools.product` for each contract variant.
+    """
+    return tuple(itertools.product(*axes))
 
-    def exec_block(block: list[dict[str, Any]], state: dict[str, Any]) -> int:
-        """Executes a list of statements and returns step count."""
-        steps = 0
-        for stmt in block:
+
+def _iter_inputs(input_ranges: dict[str, dict[str, int]]) -> Iterable[tuple[int, ...]]:
+    """Generates all input value tuples from inclusive integer ranges.
+
+    Values follow the sorted input names. Callers write them into one reused
+    environment instead of building a dict per input.
+    """
+    return _input_grid(tuple(_input_axes(input_ranges).values()))
+
+
+def _input_names_used(exprs: list[str], axes: dict[str, range]) -> list[str]:
+    """Returns the (sorted) inputs referenced by any of the expressions.
+
+    Expressions that do not compile reference none; they fail when evaluated.
+    """
+    used: set[str] = set()
+    for expr in exprs:
+        with contextlib.suppress(SyntaxError, UnsafeExpressionError, RecursionError):
+            used |= vars_in_expr(expr)
+    return [n for n in axes if n in used]
+
+
+def _all_hold(
+    exprs: list[str], codes: list[CodeType | None], env: dict[str, Any]
+) -> bool:
+    """Evaluates `_lower_expr` codes in order like `all`.
+
+    A deferred compile error is raised when its expression is reached.
+    """
+    for expr, code in zip(exprs, codes):
+        if code is None:
+            _compile_expr(expr)  # raises the deferred compile error
+        if not eval(code, _EMPTY_GLOBALS, env):
+            return False
+    return True
+
+
+# Opcodes of a lowered program (see `_lower_program` and `_run_ops`).
+_OP_ASSIGN = 0  # (op, depth, name, code): store and count one step
+_OP_CHECK = 1  # (op, depth): stop once the block's step count exceeds the limit
+_OP_WHILE = 2  # (op, depth, code, exit_pc): enter the body or leave the loop
+_OP_LOOP = 3  # (op, depth, while_pc): add body steps, check, and re-test
+_OP_IF = 4  # (op, depth, code, else_pc): count one step and pick a branch
+_OP_JUMP = 5  # (op, target_pc)
+_OP_JOIN = 6  # (op, depth): add the taken branch's steps
+_OP_RAISE = 7  # (op, exc_type, args): malformed statement reached
+_OP_COMPILE = 8  # (op, expr): expression that fails to compile was reached
+
+
+def _lower_expr(expr: str) -> CodeType | None:
+    """Compiles an expression for lowering; None defers the error to run time."""
+    try:
+        return _compile_expr(expr)
+    except (SyntaxError, UnsafeExpressionError, RecursionError):
+        return None
+
+
+def _lower_block(block: Any, depth: int, ops: list[tuple[Any, ...]]) -> int:
+    """Appends ops for a statement list and returns its maximum nesting depth.
+
+    Each block counts its own steps (counter `depth`), and malformed statements
+    become ops that raise the interpreter's error only when they are reached.
+    """
+    max_depth = depth
+    for stmt in block:
+        try:
             if "assign" in stmt:
                 assigns = stmt["assign"]
                 if not isinstance(assigns, dict):
                     raise ValueError("assign must be an object")
                 for name, expr in assigns.items():
-                    state[name] = eval_expr(str(expr), state)
-                    steps += 1
+                    code = _lower_expr(str(expr))
+                    if code is None:
+                        ops.append((_OP_COMPILE, str(expr)))
+                    else:
+                        ops.append((_OP_ASSIGN, depth, name, code))
             elif "while" in stmt:
                 w = stmt["while"]
                 cond = str(w["cond"])
+                code = _lower_expr(cond)
                 body = w.get("body", [])
-                if not isinstance(body, list):
+                if code is None:
+                    ops.append((_OP_COMPILE, cond))
+                elif not isinstance(body, list):
                     raise ValueError("while.body must be a list")
-                while bool(eval_expr(cond, state)):
-                    steps += 1
-                    steps += exec_block(body, state)
-                    if steps > step_limit:
-                        return steps
+                else:
+                    while_pc = len(ops)
+                    ops.append(None)  # patched below once the exit is known
+                    max_depth = max(max_depth, _lower_block(body, depth + 1, ops))
+                    ops.append((_OP_LOOP, depth, while_pc))
+                    ops[while_pc] = (_OP_WHILE, depth, code, len(ops))
             elif "if" in stmt:
                 i = stmt["if"]
                 cond = str(i["cond"])
+                code = _lower_expr(cond)
                 then = i.get("then", [])
                 els = i.get("else", [])
-                if not isinstance(then, list) or not isinstance(els, list):
+                if code is None:
+                    ops.append((_OP_COMPILE, cond))
+                elif not isinstance(then, list) or not isinstance(els, list):
                     raise ValueError("if.then and if.else must be lists")
-                steps += 1
-                if bool(eval_expr(cond, state)):
-                    steps += exec_block(then, state)
                 else:
-                    steps += exec_block(els, state)
+                    if_pc = len(ops)
+                    ops.append(None)
+                    max_depth = max(max_depth, _lower_block(then, depth + 1, ops))
+                    jump_pc = len(ops)
+                    ops.append(None)
+                    ops[if_pc] = (_OP_IF, depth, code, len(ops))
+                    max_depth = max(max_depth, _lower_block(els, depth + 1, ops))
+                    ops[jump_pc] = (_OP_JUMP, len(ops))
+                    ops.append((_OP_JOIN, depth))
             else:
                 raise ValueError(f"Unknown statement: {stmt}")
-            if steps > step_limit:
-                return steps
-        return steps
+        except Exception as exc:  # pylint: disable=broad-except
+            ops.append((_OP_RAISE, type(exc), exc.args))
+        ops.append((_OP_CHECK, depth))
+    return max_depth
+
+
+# A specialized op runs one lowered op against (state, step counters) and
+# returns the next pc, or `~depth` once block `depth` exceeds the step limit.
+_Step = Callable[[dict[str, Any], list[int]], int]
+
+
+def _specialize_op(pc: int, op: tuple[Any, ...], step_limit: int) -> _Step:
+    """Builds a closure for one op, capturing its operands and successor."""
+    kind = op[0]
+    nxt = pc + 1
+    if kind == _OP_ASSIGN:
+        _, depth, name, code = op
+
+        def step(state: dict[str, Any], steps: list[int]) -> int:
+            state[name] = eval(code, _EMPTY_GLOBALS, state)
+            steps[depth] += 1
+            return nxt
+
+    elif kind == _OP_CHECK:
+        _, depth = op
+
+        def step(state: dict[str, Any], steps: list[int]) -> int:
+            return nxt if steps[depth] <= step_limit else ~depth
+
+    elif kind == _OP_WHILE:
+        _, depth, code, exit_pc = op
+
+        def step(state: dict[str, Any], steps: list[int]) -> int:
+            if eval(code, _EMPTY_GLOBALS, state):
+                steps[depth] += 1
+                steps[depth + 1] = 0
+                return nxt
+            return exit_pc
+
+    elif kind == _OP_LOOP:
+        _, depth, while_pc = op
+
+        def step(state: dict[str, Any], steps: list[int]) -> int:
+            steps[depth] += steps[depth + 1]
+            return while_pc if steps[depth] <= step_limit else ~depth
+
+    elif kind == _OP_IF:
+        _, depth, code, else_pc = op
+
+        def step(state: dict[str, Any], steps: list[int]) -> int:
+            steps[depth] += 1
+            steps[depth + 1] = 0
+            return nxt if eval(code, _EMPTY_GLOBALS, state) else else_pc
+
+    elif kind == _OP_JUMP:
+        _, target = op
+
+        def step(state: dict[str, Any], steps: list[int]) -> int:
+            return target
+
+    elif kind == _OP_JOIN:
+        _, depth = op
+
+        def step(state: dict[str, Any], steps: list[int]) -> int:
+            steps[depth] += steps[depth + 1]
+            return nxt
+
+    elif kind == _OP_RAISE:
+        _, exc_type, args = op
+
+        def step(state: dict[str, Any], steps: list[int]) -> int:
+            raise exc_type(*args)
+
+    else:
+        _, expr = op
+
+        def step(state: dict[str, Any], steps: list[int]) -> int:
+            _compile_expr(expr)  # raises the deferred compile error
+            raise AssertionError(op)
+
+    return step
+
+
+def _lower_program(
+    program: list[dict[str, Any]], step_limit: int
+) -> tuple[list[_Step], int]:
+    """Lowers a program to specialized ops; returns them with the counters needed."""
+    ops: list[tuple[Any, ...]] = []
+    max_depth = _lower_block(program, 0, ops)
+    steps = [_specialize_op(pc, op, step_limit) for pc, op in enumerate(ops)]
+    return steps, max_depth + 2
+
+
+def _run_ops(ops: list[_Step], counters: int, state: dict[str, Any]) -> int:
+    """Executes a lowered program and returns its step count.
+
+    Exceeding the step limit in any block always ends the run as
+    nonterminating, so that block's count is returned immediately.
+    """
+    steps = [0] * counters
+    pc = 0
+    n = len(ops)
+    while 0 <= pc < n:
+        pc = ops[pc](state, steps)
+    return steps[~pc] if pc < 0 else steps[0]
+
+
+# Per-input outcomes of a compiled program (see `_compiled_program`).
+_OK = 0
+_VIOLATION = 1
+_NONTERM = 2
+
+
+class _UnsupportedProgram(Exception):
+    """Raised when a program cannot be compiled and must be interpreted."""
+
+
+def _var_source(name: Any) -> str:
+    """Returns the prefixed local for a variable name, which is pasted into
+    generated source and so must be a plain identifier."""
+    if not isinstance(name, str) or not name.isidentifier() or keyword.iskeyword(name):
+        raise _UnsupportedProgram(name)
+    return _VAR_PREFIX + name
+
+
+def _expr_source(expr: str) -> str:
+    """Returns Python source for a validated expression over prefixed names."""
+    _compile(expr)  # validates
+    tree = ast.parse(expr, mode="eval")
+    tree = _PrefixNames().visit(_BoolOpToBool().visit(tree))
+    return f"({ast.unparse(tree)})"
+
+
+def _assigned_names(block: Any) -> set[str]:
+    """Returns every variable a (possibly malformed) block may assign."""
+    names: set[str] = set()
+    if not isinstance(block, list):
+        return names
+    for stmt in block:
+        if not isinstance(stmt, dict):
+            continue
+        if isinstance(stmt.get("assign"), dict):
+            names.update(stmt["assign"])
+        for key, parts in (("while", ("body",)), ("if", ("then", "else"))):
+            node = stmt.get(key)
+            if isinstance(node, dict):
+                for part in parts:
+                    names |= _assigned_names(node.get(part))
+    return names
 
-    for inp in _iter_inputs(input_ranges):
-        considered += 1
-        state: dict[str, Any] = dict(inp)
+
+def _block_source(
+    block: Any,
+    depth: int,
+    indent: str,
+    step_limit: int,
+    lines: list[str],
+    assigned: set[str],
+) -> None:
+    """Appends code for a statement list, mirroring `_run_ops`.
+
+    Each block keeps its own step counter `_s<depth>` because `_run_ops`
+    compares the step limit against block-local counts; exceeding it anywhere
+    always unwinds to a nontermination verdict, so it returns directly.
+    A `while` condition over variables the program never assigns cannot
+    change, so it is tested once on entry and the loop runs until it
+    exceeds the step limit or fails.
+    """
+    if not isinstance(block, list):
+        raise _UnsupportedProgram(block)
+    steps = f"_s{depth}"
+    lines.append(f"{indent}{steps} = 0")
+    for stmt in block:
+        if not isinstance(stmt, dict):
+            raise _UnsupportedProgram(stmt)
+        if "assign" in stmt:
+            assigns = stmt["assign"]
+            if not isinstance(assigns, dict):
+                raise _UnsupportedProgram(stmt)
+            for name, expr in assigns.items():
+                lines.append(f"{indent}{_var_source(name)} = {_expr_source(str(expr))}")
+            if assigns:
+                lines.append(f"{indent}{steps} += {len(assigns)}")
+        elif "while" in stmt:
+            w = stmt["while"]
+            if not isinstance(w, dict) or "cond" not in w:
+                raise _UnsupportedProgram(stmt)
+            cond = _expr_source(str(w["cond"]))
+            loop = indent
+            if vars_in_expr(str(w["cond"])).isdisjoint(assigned):
+                lines.append(f"{indent}if {cond}:")
+                loop = indent + "    "
+                cond = "True"
+            body = loop + "    "
+            lines.append(f"{loop}while {cond}:")
+            lines.append(f"{body}{steps} += 1")
+            _block_source(w.get("body", []), depth + 1, body, step_limit, lines, assigned)
+            lines.append(f"{body}{steps} += _s{depth + 1}")
+            lines.append(f"{body}if {steps} > {step_limit}:")
+            lines.append(f"{body}    return {_NONTERM}")
+        elif "if" in stmt:
+            i = stmt["if"]
+            if not isinstance(i, dict) or "cond" not in i:
+                raise _UnsupportedProgram(stmt)
+            lines.append(f"{indent}{steps} += 1")
+            lines.append(f"{indent}if {_expr_source(str(i['cond']))}:")
+            then, els = i.get("then", []), i.get("else", [])
+            _block_source(then, depth + 1, indent + "    ", step_limit, lines, assigned)
+            lines.append(f"{indent}else:")
+            _block_source(els, depth + 1, indent + "    ", step_limit, lines, assigned)
+            lines.append(f"{indent}{steps} += _s{depth + 1}")
+        else:
+            raise _UnsupportedProgram(stmt)
+        lines.append(f"{indent}if {steps} > {step_limit}:")
+        lines.append(f"{indent}    return {_NONTERM}")
+
+
+def _program_source(
+    program: list[dict[str, Any]], post: list[str], names: list[str], step_limit: int
+) -> str:
+    """Generates `_run(*inputs) -> outcome` for a program and its postconditions.
+
+    Statements become native Python control flow over local variables, so an
+    input costs one Python call instead of an `eval` per executed expression.
+    """
+    params = ", ".join(_var_source(n) for n in names)
+    lines = [f"def _run({params}):", "    try:"]
+    _block_source(program, 0, "        ", step_limit, lines, _assigned_names(program))
+    lines.append(f"        if _s0 > {step_limit}:")
+    lines.append(f"            return {_NONTERM}")
+    if post:
+        failed = " or ".join(f"not {_expr_source(a)}" for a in post)
+        lines.append(f"        if {failed}:")
+        lines.append(f"            return {_VIOLATION}")
+    lines.append(f"        return {_OK}")
+    lines.append("    except _errors:")
+    lines.append(f"        return {_VIOLATION}")
+    return "\n".join(lines) + "\n"
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_program_key(
+    program_key: str, post: tuple[str, ...], names: tuple[str, ...], step_limit: int
+) -> Callable[..., int] | None:
+    """Compiles a program given as JSON text (hashable, order-preserving)."""
+    program = json.loads(program_key)
+    try:
+        source = _program_source(program, list(post), list(names), step_limit)
+        code = compile(source, "<program>", "exec")
+    except (_UnsupportedProgram, UnsafeExpressionError, SyntaxError, RecursionError):
+        # SyntaxError covers CPython's limit on statically nested blocks.
+        return None
+    namespace: dict[str, Any] = {"__builtins__": {}, "_errors": _EVAL_ERRORS}
+    exec(code, namespace)
+    return namespace["_run"]
+
+
+def _compiled_program(
+    program: list[dict[str, Any]], post: list[str], names: list[str], step_limit: int
+) -> Callable[..., int] | None:
+    """Returns a compiled `_run(*inputs)` for the program, or None to interpret.
+
+    Malformed programs (whose errors must surface per input) and programs
+    nested too deeply for CPython's compiler fall back to `_run_ops`.
+    """
+    return _compile_program_key(
+        json.dumps(program), tuple(post), tuple(names), int(step_limit)
+    )
+
+
+def _program_runner(
+    program: list[dict[str, Any]], post: list[str], names: list[str], step_limit: int
+) -> Callable[..., int]:
+    """Returns `run(*inputs) -> outcome`, compiled if possible, else interpreted."""
+    post_codes = [_lower_expr(a) for a in post]
+    run = _compiled_program(program, post, names, step_limit)
+    if run is not None:
+        return run
+    ops, counters = _lower_program(program, step_limit)
+    state: dict[str, Any] = {}
+
+    def interpret(*values: int) -> int:
+        # Reuse one environment; clearing drops the previous run's locals.
+        state.clear()
+        state.update(zip(names, values))
         try:
-            if pre and not all(bool(eval_expr(p, state)) for p in pre):
-                continue
-            sat_pre += 1
-            steps = exec_block(program, state)
-            if steps > step_limit:
-                nonterm += 1
+            if _run_ops(ops, counters, state) > step_limit:
+                return _NONTERM
+            if _all_hold(post, post_codes, state):
+                return _OK
+        except _EVAL_ERRORS:
+            pass
+        return _VIOLATION
+
+    return interpret
+
+
+# Outcome characters (see `run_contract_batch`) to bitmask characters.
+_OUTCOME_VIOLATION = str.maketrans(f"{_OK}{_VIOLATION}{_NONTERM}", "010")
+_OUTCOME_NONTERM = str.maketrans(f"{_OK}{_VIOLATION}{_NONTERM}", "001")
+
+
+def run_contract(
+    *,
+    program: list[dict[str, Any]],
+    pre: list[str],
+    post: list[str],
+    input_ranges: dict[str, dict[str, int]],
+    step_limit: int,
+    stop_on_first_violation: bool = False,
+) -> RunResult:
+    """Executes the program for all bounded inputs and checks the contract.
+
+    With `stop_on_first_violation`, the program runs stop at the first
+    violation found: the violation count then only tells whether there are
+    any, nontermination is counted up to that point, and `first_failure` is a
+    failing input, not necessarily the first.
+    """
+    nonterm = 0
+
+    # Enumerate the inputs the preconditions mention first; a rejected
+    # projection rejects every extension by the remaining inputs at once.
+    axes = _input_axes(input_ranges)
+    pre_names = _input_names_used(pre, axes)
+    pre_axes = [axes[n] for n in pre_names]
+    rest_names = [n for n in axes if n not in pre_names]
+    rest_axes = [axes[n] for n in rest_names]
+    rest_count = math.prod(len(r) for r in rest_axes)
+    run = _program_runner(program, post, pre_names + rest_names, step_limit)
+
+    # Conjoin the preconditions as bitmasks over the projection, in order: a
+    # point errs at the first predicate that errs while all earlier ones hold.
+    projection = (tuple(pre_names), tuple(pre_axes))
+    accepted, errors, fatal = _conjoin_masks(pre, *projection)
+    if fatal:
+        # Re-raise the first unexpected exception by evaluating its point.
+        values = _lowest_point(fatal, projection[1])
+        env = dict(zip(pre_names, values))
+        all(eval(_compile_expr(p), _EMPTY_GLOBALS, env) for p in pre)
+        raise AssertionError(values)  # unreachable: the evaluation raises
+    considered = math.prod(len(r) for r in pre_axes) * rest_count
+    violations = errors.bit_count() * rest_count
+    sat_pre = accepted.bit_count() * rest_count
+
+    # Candidates for the first failing input, as pre + rest values: the
+    # smallest extension of each rejected-by-error point, and the first
+    # failure under each accepted point (rest inputs are enumerated in order).
+    rest_grid = _input_grid(tuple(rest_axes))
+    failures = [
+        pre_values + rest_grid[0]
+        for pre_values in itertools.compress(
+            _input_grid(projection[1]), _mask_selectors(errors)
+        )
+    ]
+    accepted_values = itertools.compress(
+        _input_grid(projection[1]), _mask_selectors(accepted)
+    )
+    for pre_values in accepted_values:
+        if stop_on_first_violation and violations:
+            break
+        failed = False
+        for rest_values in rest_grid:
+            outcome = run(*pre_values, *rest_values)
+            if outcome == _OK:
                 continue
-            if post and not all(bool(eval_expr(a, state)) for a in post):
+            if outcome == _VIOLATION:
                 violations += 1
-        except (KeyError, UnsafeExpressionError, ValueError, ZeroDivisionError):
-            violations += 1
+            else:
+                nonterm += 1
+            if not failed:
+                failures.append(pre_values + rest_values)
+                failed = True
+            if stop_on_first_violation and violations:
+                break
 
+    names = pre_names + rest_names
+    order = [names.index(n) for n in axes]
+    first = min((tuple(v[k] for k in order) for v in failures), default=None)
     return RunResult(
         considered_inputs=considered,
         satisfying_pre=sat_pre,
         violations=violations,
         nontermination=nonterm,
+        first_failure=None if first is None else dict(zip(axes, first)),
     )
 
 
+def _run_contract_call(kwargs: dict[str, Any]) -> RunResult:
+    """Picklable adapter so `run_contract` can be mapped over a process pool."""
+    return run_contract(**kwargs)
+
+
+def process_pool(jobs: int | None) -> ContextManager[Executor | None]:
+    """Returns a process pool with `jobs` workers (default: all CPUs).
+
+    Yields None instead when the work should run sequentially (`jobs <= 1`).
+    """
+    workers = jobs if jobs is not None else (os.cpu_count() or 1)
+    if workers <= 1:
+        return contextlib.nullcontext()
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def run_contract_sweep(
+    *,
+    program: list[dict[str, Any]],
+    pre_variants: list[list[str]],
+    post: list[str],
+    input_ranges: dict[str, dict[str, int]],
+    step_limit: int,
+    executor: Executor | None = None,
+    stop_on_first_violation: bool = False,
+) -> list[RunResult]:
+    """Runs `run_contract` once per precondition list, in order.
+
+    The runs are independent, so with an `executor` they are spread across its
+    workers; without one they run sequentially in this process.
+    """
+    calls = [
+        {
+            "program": program,
+            "pre": list(pre),
+            "post": post,
+            "input_ranges": input_ranges,
+            "step_limit": step_limit,
+            "stop_on_first_violation": stop_on_first_violation,
+        }
+        for pre in pre_variants
+    ]
+    if executor is None or len(calls) <= 1:
+        return [run_contract(**c) for c in calls]
+    return list(executor.map(_run_contract_call, calls))
+
+
+def run_contract_batch(
+    *,
+    program: list[dict[str, Any]],
+    pre: list[str],
+    post: list[str],
+    input_ranges: dict[str, dict[str, int]],
+    step_limit: int,
+    drop_indices: Iterable[int],
+) -> list[RunResult]:
+    """Runs `run_contract` without `pre[i]`, for each i in `drop_indices`.
+
+    Program outcomes do not depend on the preconditions, so the program runs
+    once per input any variant accepts; each variant then only combines its
+    precondition masks with the shared outcome masks. An unexpected exception
+    is raised for the first variant that hits one, as with separate calls.
+    """
+    axes = _input_axes(input_ranges)
+    names = tuple(axes)
+    grid_axes = tuple(axes.values())
+    grid = _input_grid(grid_axes)
+    variants = [pre[:i] + pre[i + 1 :] for i in drop_indices]
+    conjunctions = [_conjoin_masks(v, names, grid_axes) for v in variants]
+
+    # Variants are handled in order, as `run_contract` would handle them one
+    # by one: first an unexpected exception from the preconditions, then the
+    # program runs on the accepted inputs not already run for an earlier one.
+    run = _program_runner(program, post, list(names), step_limit)
+    outcomes = ["0"] * len(grid)
+    done = 0
+    for variant, (accepted, _, fatal) in zip(variants, conjunctions):
+        if fatal:
+            # Re-raise the first unexpected exception by evaluating its point.
+            env = dict(zip(names, _lowest_point(fatal, grid_axes)))
+            all(eval(_compile_expr(p), _EMPTY_GLOBALS, env) for p in variant)
+            raise AssertionError(env)  # unreachable: the evaluation raises
+        todo = accepted & ~done
+        for k in itertools.compress(range(len(grid)), _mask_selectors(todo)):
+            outcomes[k] = str(run(*grid[k]))
+        done |= todo
+    bits = "".join(reversed(outcomes))
+    violating = int(bits.translate(_OUTCOME_VIOLATION), 2)
+    nonterminating = int(bits.translate(_OUTCOME_NONTERM), 2)
+
+    results: list[RunResult] = []
+    for accepted, errors, _ in conjunctions:
+        failing = errors | accepted & (violating | nonterminating)
+        results.append(
+            RunResult(
+                considered_inputs=len(grid),
+                satisfying_pre=accepted.bit_count(),
+                violations=(errors | accepted & violating).bit_count(),
+                nontermination=(accepted & nonterminating).bit_count(),
+                first_failure=(
+                    dict(zip(names, _lowest_point(failing, grid_axes)))
+                    if failing
+                    else None
+                ),
+            )
+        )
+    return results
+
+
 def find_counterexample(
     *,
     program: list[dict[str, Any]],
@@ -258,58 +881,21 @@ def find_counterexample(
       - violates a postcondition at termination, or
       - triggers an evaluation/runtime error in this prototype.
     """
+    pre_codes = [_lower_expr(p) for p in pre]
+    axes = _input_axes(input_ranges)
+    names = list(axes)
+    run = _program_runner(program, post, names, step_limit)
 
-    def exec_block(block: list[dict[str, Any]], state: dict[str, Any]) -> int:
-        steps = 0
-        for stmt in block:
-            if "assign" in stmt:
-                assigns = stmt["assign"]
-                if not isinstance(assigns, dict):
-                    raise ValueError("assign must be an object")
-                for name, expr in assigns.items():
-                    state[name] = eval_expr(str(expr), state)
-                    steps += 1
-            elif "while" in stmt:
-                w = stmt["while"]
-                cond = str(w["cond"])
-                body = w.get("body", [])
-                if not isinstance(body, list):
-                    raise ValueError("while.body must be a list")
-                while bool(eval_expr(cond, state)):
-                    steps += 1
-                    steps += exec_block(body, state)
-                    if steps > step_limit:
-                        return steps
-            elif "if" in stmt:
-                i = stmt["if"]
-                cond = str(i["cond"])
-                then = i.get("then", [])
-                els = i.get("else", [])
-                if not isinstance(then, list) or not isinstance(els, list):
-                    raise ValueError("if.then and if.else must be lists")
-                steps += 1
-                if bool(eval_expr(cond, state)):
-                    steps += exec_block(then, state)
-                else:
-                    steps += exec_block(els, state)
-            else:
-                raise ValueError(f"Unknown statement: {stmt}")
-            if steps > step_limit:
-                return steps
-        return steps
-
-    for inp in _iter_inputs(input_ranges):
-        state: dict[str, Any] = dict(inp)
+    inp: dict[str, Any] = {}
+    for values in _iter_inputs(input_ranges):
+        inp.update(zip(names, values))
         try:
-            if pre and not all(bool(eval_expr(p, state)) for p in pre):
+            if not _all_hold(pre, pre_codes, inp):
                 continue
-            steps = exec_block(program, state)
-            if steps > step_limit:
-                return inp
-            if post and not all(bool(eval_expr(a, state)) for a in post):
-                return inp
-        except (KeyError, UnsafeExpressionError, ValueError, ZeroDivisionError):
-            return inp
+        except _EVAL_ERRORS:
+            return dict(inp)
+        if run(*values) != _OK:
+            return dict(inp)
 
     return None
 
@@ -321,13 +907,40 @@ def _implies_bounded(
     input_ranges: dict[str, dict[str, int]],
 ) -> bool:
     """Checks (bounded) whether antecedent implies consequent."""
-    for inp in _iter_inputs(input_ranges):
-        env: dict[str, Any] = dict(inp)
-        if antecedent and not all(bool(eval_expr(p, env)) for p in antecedent):
-            continue
-        if not bool(eval_expr(consequent, env)):
-            return False
-    return True
+    # Inputs mentioned by neither side cannot change the outcome.
+    axes = _input_axes(input_ranges)
+    names = _input_names_used([*antecedent, consequent], axes)
+    projection = (tuple(names), tuple(axes[n] for n in names))
+    conjunction = _conjoin_masks(antecedent, *projection)
+    return _implication(conjunction, antecedent, consequent, *projection)
+
+
+def _implication(
+    conjunction: tuple[int, int, int],
+    antecedent: list[str],
+    consequent: str,
+    names: tuple[str, ...],
+    axes: tuple[range, ...],
+) -> bool:
+    """Decides an implication given the antecedent's `_conjoin_masks` result."""
+    accepted, errors, fatal = conjunction
+    true, error, raises = _predicate_masks(consequent, names, axes)
+    failed = errors | fatal | accepted & (error | raises)
+    refuted = accepted & ~(true | error | raises)
+    # Points are decided in lexicographic order: the first counterexample
+    # answers False unless an evaluation error comes before it.
+    first = (failed | refuted) & -(failed | refuted)
+    if not first:
+        return True
+    if first & refuted:
+        return False
+    env = dict(zip(names, _lowest_point(first, axes)))
+    try:
+        all(eval(_compile_expr(p), _EMPTY_GLOBALS, env) for p in antecedent)
+        eval(_compile_expr(consequent), _EMPTY_GLOBALS, env)
+    except NameError as exc:
+        raise KeyError(f"Unknown variable: {exc.name}") from None
+    raise AssertionError(env)  # unreachable: the evaluation raises
 
 
 def implies_bounded(
@@ -341,6 +954,50 @@ def implies_bounded(
     )
 
 
+def implies_bounded_batch(
+    *, pre: list[str], input_ranges: dict[str, dict[str, int]]
+) -> list[bool]:
+    """Checks (bounded) for each precondition whether the others imply it.
+
+    Equivalent to one `implies_bounded` call per precondition, in order, but
+    the checks share their predicate masks and prefix conjunctions.
+    """
+    implied = _implied_by_others(pre, input_ranges)
+    for i, ok in enumerate(implied):
+        if ok is None:  # raise what the individual check raises
+            _implies_bounded(
+                antecedent=pre[:i] + pre[i + 1 :],
+                consequent=pre[i],
+                input_ranges=input_ranges,
+            )
+    return [bool(ok) for ok in implied]
+
+
+def _implied_by_others(
+    pre: list[str], input_ranges: dict[str, dict[str, int]]
+) -> list[bool | None]:
+    """Checks whether each precondition is implied by all the others.
+
+    All checks share one projection, and the conjunction of each prefix of
+    `pre` is reused, so N checks cost about as much as one. A None entry
+    means that check raised; `_implies_bounded` reproduces the error.
+    """
+    axes = _input_axes(input_ranges)
+    names = _input_names_used(pre, axes)
+    projection = (tuple(names), tuple(axes[n] for n in names))
+    implied: list[bool | None] = []
+    prefix = None
+    for i, p in enumerate(pre):
+        others = pre[:i] + pre[i + 1 :]
+        try:
+            conjunction = _conjoin_masks(pre[i + 1 :], *projection, start=prefix)
+            implied.append(_implication(conjunction, others, p, *projection))
+        except Exception:  # pylint: disable=broad-except
+            implied.append(None)
+        prefix = _conjoin_masks([p], *projection, start=prefix)
+    return implied
+
+
 def _fmt_pct(n: int, d: int) -> str:
     """Formats n/d as a percentage with 2 decimal places."""
     if d <= 0:
@@ -348,8 +1005,14 @@ def _fmt_pct(n: int, d: int) -> str:
     return f"{(100.0 * n / d):.2f}%"
 
 
-def analyze(path: Path, *, step_limit_override: int | None = None) -> int:
-    """Loads a JSON spec, runs checks, and prints a human-readable report."""
+def analyze(
+    path: Path, *, step_limit_override: int | None = None, jobs: int | None = None
+) -> int:
+    """Loads a JSON spec, runs checks, and prints a human-readable report.
+
+    `jobs` bounds the worker processes used for the single-redundancy sweep
+    (default: all CPUs; 1 runs it sequentially).
+    """
     if not path.exists():
         raise FileNotFoundError(path)
 
@@ -383,18 +1046,33 @@ def analyze(path: Path, *, step_limit_override: int | None = None) -> int:
         print("")
 
     if pre:
+        implied = _implied_by_others(pre, input_ranges)
+
         print("Single precondition redundancy (bounded verifier-based check):")
-        redundant: list[int] = []
-        for i, p in enumerate(pre, start=1):
-            reduced_pre = [x for j, x in enumerate(pre, start=1) if j != i]
-            rr = run_contract(
+        # Dropping a precondition the others imply leaves the accepted inputs
+        # unchanged, so with a violation-free base it is redundant without
+        # running the contract again (IC pruning).
+        pruned = {i for i, ok in enumerate(implied) if ok and base.violations == 0}
+        # Dropping a repeat of an earlier precondition (same canonical form)
+        # changes no evaluation at all: the reduced run is the base run.
+        canon = [canonical_expr(p) for p in pre]
+        repeated = {i for i, c in enumerate(canon) if c in canon[:i]}
+        to_run = [i for i in range(len(pre)) if i not in pruned | repeated]
+        with process_pool(jobs) as executor:
+            reduced_runs = run_contract_sweep(
                 program=program,
-                pre=reduced_pre,
+                pre_variants=[pre[:i] + pre[i + 1 :] for i in to_run],
                 post=post,
                 input_ranges=input_ranges,
                 step_limit=step_limit,
+                executor=executor,
+                stop_on_first_violation=True,  # only the verdict is reported
             )
-            is_redundant = rr.violations == 0
+        violations = {i: base.violations for i in repeated}
+        violations.update(zip(to_run, (rr.violations for rr in reduced_runs)))
+        redundant: list[int] = []
+        for i, p in enumerate(pre, start=1):
+            is_redundant = violations.get(i - 1, 0) == 0
             status = "REDUNDANT" if is_redundant else "NEEDED"
             print(f"- pre{i}: {status} | {p}")
             if is_redundant:
@@ -405,12 +1083,13 @@ def analyze(path: Path, *, step_limit_override: int | None = None) -> int:
 
         print("Implication checking (bounded, IC-like):")
         for i, p in enumerate(pre, start=1):
-            others = [x for j, x in enumerate(pre, start=1) if j != i]
-            ok = _implies_bounded(
-                antecedent=others,
-                consequent=p,
-                input_ranges=input_ranges,
-            )
+            ok = implied[i - 1]
+            if ok is None:  # surface the failure of the check itself
+                ok = _implies_bounded(
+                    antecedent=pre[: i - 1] + pre[i:],
+                    consequent=p,
+                    input_ranges=input_ranges,
+                )
             status = "IMPLIED" if ok else "NOT implied"
             print(f"- pre{i}: {status} | {p}")
         print("")
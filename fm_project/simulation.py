@@ -17,12 +17,15 @@ We then compare three detectors (all bounded):
 
 from __future__ import annotations
 
-import json
+import functools
+import os
 import random
+from collections import deque
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+from fm_project import json_io
 from fm_project import redundancy_checker
 
 
@@ -55,6 +58,21 @@ def _sub_program() -> list[dict[str, Any]]:
     ]
 
 
+# Every benchmark spec shares one program and postcondition; the checker and
+# the DC analysis only read them.
+_SUB_PROGRAM = _sub_program()
+_SUB_POST = ["y == 0"]
+
+
+def _closed_form_sub(n: int, m: int) -> tuple[dict[str, int], int]:
+    """Returns the final store and step count of `_SUB_PROGRAM` on N, M.
+
+    The loop runs max(N, 0) times: 3 assignment steps, then 4 per iteration.
+    """
+    k = max(n, 0)
+    return {"N": n, "M": m, "x": k, "y": n - k, "z": m - k}, 3 + 4 * k
+
+
 def _build_spec(*, n_min: int, n_max: int, m_min: int, m_max: int) -> dict[str, Any]:
     """Builds a JSON spec dictionary for the benchmark."""
     # Necessary: N >= 0 (otherwise, y stays N and y==0 can fail)
@@ -77,38 +95,23 @@ def _build_spec(*, n_min: int, n_max: int, m_min: int, m_max: int) -> dict[str,
             f"N <= {n_max_redundant}",  # range redundant
             "M >= 0",  # independency redundant
         ],
-        "post": ["y == 0"],
-        "program": _sub_program(),
+        "post": _SUB_POST,
+        "program": _SUB_PROGRAM,
     }
 
 
-def _ic_like_detected(
-    *,
-    pre: list[str],
-    input_ranges: dict[str, dict[str, int]],
-) -> set[int]:
-    detected: set[int] = set()
-    for idx, p in enumerate(pre):
-        others = [x for j, x in enumerate(pre) if j != idx]
-        if redundancy_checker.implies_bounded(
-            antecedent=others,
-            consequent=p,
-            input_ranges=input_ranges,
-        ):
-            detected.add(idx)
-    return detected
-
-
 def _assigned_vars(program: list[dict[str, Any]]) -> set[str]:
     assigned: set[str] = set()
-    for stmt in program:
+    stack = list(program)
+    while stack:
+        stmt = stack.pop()
         if "assign" in stmt:
             assigned.update(stmt["assign"].keys())
         elif "while" in stmt:
-            assigned |= _assigned_vars(stmt["while"].get("body", []))
+            stack.extend(stmt["while"].get("body", []))
         elif "if" in stmt:
-            assigned |= _assigned_vars(stmt["if"].get("then", []))
-            assigned |= _assigned_vars(stmt["if"].get("else", []))
+            stack.extend(stmt["if"].get("then", []))
+            stack.extend(stmt["if"].get("else", []))
     return assigned
 
 
@@ -116,152 +119,268 @@ def _dependency_sources_for_post(
     *,
     program: list[dict[str, Any]],
     post: list[str],
-) -> set[str]:
+) -> frozenset[str]:
     """Computes vars that syntactically influence vars in post (DC-like)."""
     post_vars: set[str] = set()
     for a in post:
         post_vars |= redundancy_checker.vars_in_expr(a)
 
-    forward: dict[str, set[str]] = {}
+    # Edges point from an influenced variable back to its sources.
+    reverse: dict[str, set[str]] = {}
 
     def add_edge(src: str, dst: str) -> None:
-        forward.setdefault(src, set()).add(dst)
-
-    def walk(block: list[dict[str, Any]]) -> None:
-        for stmt in block:
-            if "assign" in stmt:
-                assigns = stmt["assign"]
-                for dst, expr in assigns.items():
-                    for src in redundancy_checker.vars_in_expr(str(expr)):
-                        add_edge(src, dst)
-            elif "while" in stmt:
-                w = stmt["while"]
-                cond_vars = redundancy_checker.vars_in_expr(str(w["cond"]))
-                body = w.get("body", [])
-                body_assigned = _assigned_vars(body)
-                for cv in cond_vars:
-                    for av in body_assigned:
-                        add_edge(cv, av)
-                walk(body)
-            elif "if" in stmt:
-                i = stmt["if"]
-                cond_vars = redundancy_checker.vars_in_expr(str(i["cond"]))
-                then = i.get("then", [])
-                els = i.get("else", [])
-                assigned = _assigned_vars(then) | _assigned_vars(els)
-                for cv in cond_vars:
-                    for av in assigned:
-                        add_edge(cv, av)
-                walk(then)
-                walk(els)
-
-    walk(program)
+        reverse.setdefault(dst, set()).add(src)
 
-    # Reverse reachability from post vars.
-    reverse: dict[str, set[str]] = {}
-    for src, dsts in forward.items():
-        for dst in dsts:
-            reverse.setdefault(dst, set()).add(src)
+    # Edge order is irrelevant (they go into sets), so the statements can be
+    # visited with an explicit stack instead of recursing into nested blocks.
+    stack = list(program)
+    while stack:
+        stmt = stack.pop()
+        if "assign" in stmt:
+            assigns = stmt["assign"]
+            for dst, expr in assigns.items():
+                for src in redundancy_checker.vars_in_expr(str(expr)):
+                    add_edge(src, dst)
+        elif "while" in stmt:
+            w = stmt["while"]
+            cond_vars = redundancy_checker.vars_in_expr(str(w["cond"]))
+            body = w.get("body", [])
+            body_assigned = _assigned_vars(body)
+            for cv in cond_vars:
+                for av in body_assigned:
+                    add_edge(cv, av)
+            stack.extend(body)
+        elif "if" in stmt:
+            i = stmt["if"]
+            cond_vars = redundancy_checker.vars_in_expr(str(i["cond"]))
+            then = i.get("then", [])
+            els = i.get("else", [])
+            assigned = _assigned_vars(then) | _assigned_vars(els)
+            for cv in cond_vars:
+                for av in assigned:
+                    add_edge(cv, av)
+            stack.extend(then)
+            stack.extend(els)
 
+    # Reverse reachability from post vars.
     reachable: set[str] = set(post_vars)
-    queue: list[str] = list(post_vars)
+    queue: deque[str] = deque(post_vars)
     while queue:
-        v = queue.pop()
-        for src in reverse.get(v, set()):
+        v = queue.popleft()
+        for src in reverse.get(v, ()):
             if src not in reachable:
                 reachable.add(src)
                 queue.append(src)
 
-    return reachable
+    return frozenset(reachable)
 
 
-def _dc_like_detected(
+def _sub_vc_verdicts(
     *,
-    program: list[dict[str, Any]],
     pre: list[str],
     post: list[str],
-) -> set[int]:
-    influencing_vars = _dependency_sources_for_post(program=program, post=post)
-    detected: set[int] = set()
-    for idx, p in enumerate(pre):
-        if redundancy_checker.vars_in_expr(p).isdisjoint(influencing_vars):
-            detected.add(idx)
-    return detected
-
+    input_ranges: dict[str, dict[str, int]],
+    step_limit: int,
+) -> list[bool] | None:
+    """VC verdicts for `_SUB_PROGRAM` over whole-grid bitmasks.
+
+    Preconditions are evaluated on the inputs and postconditions on the final
+    stores, which come from `_closed_form_sub` instead of running the loop.
+    Each predicate becomes one int bitmask over the input grid, and every
+    leave-one-out verdict is a few mask operations. Returns None if an
+    expression fails to evaluate, leaving the exact error semantics to the
+    generic checker.
+    """
+    inputs: list[dict[str, int]] = []
+    stores: list[dict[str, int]] = []
+    terminates = 0
+    for n in range(input_ranges["N"]["min"], input_ranges["N"]["max"] + 1):
+        for m in range(input_ranges["M"]["min"], input_ranges["M"]["max"] + 1):
+            store, steps = _closed_form_sub(n, m)
+            if steps <= step_limit:
+                terminates |= 1 << len(stores)
+            inputs.append({"N": n, "M": m})
+            stores.append(store)
+
+    def holds(expr: str, envs: list[dict[str, int]]) -> int:
+        return sum(
+            1 << bit
+            for bit, env in enumerate(envs)
+            if redundancy_checker.eval_expr(expr, env)
+        )
 
-def _vc_detected(
+    try:
+        pre_masks = [holds(p, inputs) for p in pre]
+        ok = terminates
+        for a in post:
+            ok &= holds(a, stores)
+    except (KeyError, ValueError, ZeroDivisionError):
+        return None
+
+    # suffix[i] is the conjunction of pre_masks[i:], so the inputs accepted
+    # without pre[idx] are prefix & suffix[idx + 1] (linear, not quadratic).
+    everything = (1 << len(inputs)) - 1
+    suffix = [everything] * (len(pre) + 1)
+    for idx in range(len(pre) - 1, -1, -1):
+        suffix[idx] = suffix[idx + 1] & pre_masks[idx]
+    verdicts: list[bool] = []
+    prefix = everything
+    for idx, mask in enumerate(pre_masks):
+        verdicts.append(not prefix & suffix[idx + 1] & ~ok)
+        prefix &= mask
+    return verdicts
+
+
+def _vc_verdicts(
     *,
     program: list[dict[str, Any]],
     pre: list[str],
     post: list[str],
     input_ranges: dict[str, dict[str, int]],
     step_limit: int,
-) -> set[int]:
-    detected: set[int] = set()
-    for idx in range(len(pre)):
-        reduced = [x for j, x in enumerate(pre) if j != idx]
-        rr = redundancy_checker.run_contract(
-            program=program,
-            pre=reduced,
-            post=post,
-            input_ranges=input_ranges,
-            step_limit=step_limit,
+) -> list[bool]:
+    """Whether the contract still holds with each precondition removed."""
+    if program is _SUB_PROGRAM and input_ranges.keys() == {"N", "M"}:
+        verdicts = _sub_vc_verdicts(
+            pre=pre, post=post, input_ranges=input_ranges, step_limit=step_limit
         )
-        if rr.violations == 0 and rr.nontermination == 0:
-            detected.add(idx)
-    return detected
-
-
-def run_simulation(*, num_programs: int, seed: int) -> dict[str, Any]:
-    """Runs the synthetic benchmark and returns a JSON-serializable report."""
+        if verdicts is not None:
+            return verdicts
+    reduced_runs = redundancy_checker.run_contract_batch(
+        program=program,
+        pre=pre,
+        post=post,
+        input_ranges=input_ranges,
+        step_limit=step_limit,
+        drop_indices=range(len(pre)),
+    )
+    return [rr.violations == 0 and rr.nontermination == 0 for rr in reduced_runs]
+
+
+def _detect_all(
+    *,
+    program: list[dict[str, Any]],
+    pre: list[str],
+    post: list[str],
+    input_ranges: dict[str, dict[str, int]],
+    step_limit: int,
+    influencing_vars: frozenset[str],
+) -> tuple[set[int], set[int], set[int]]:
+    """Runs the IC-like, DC-like and VC detectors in one pass over `pre`.
+
+    The IC and VC verdicts are computed batch-wise up front; the DC check is a
+    variable-set test. Returns the indices each detector flags as redundant.
+    """
+    implied = redundancy_checker.implies_bounded_batch(
+        pre=pre, input_ranges=input_ranges
+    )
+    holds_without = _vc_verdicts(
+        program=program,
+        pre=pre,
+        post=post,
+        input_ranges=input_ranges,
+        step_limit=step_limit,
+    )
+    # `vars_in_expr` hands back cached frozensets, and `influencing_vars` is one
+    # too, so the DC test is a frozenset-to-frozenset `isdisjoint`.
+    pre_vars = [redundancy_checker.vars_in_expr(p) for p in pre]
+    ic: set[int] = set()
+    dc: set[int] = set()
+    vc: set[int] = set()
+    for idx, (is_implied, used, holds) in enumerate(
+        zip(implied, pre_vars, holds_without)
+    ):
+        if is_implied:
+            ic.add(idx)
+        if used.isdisjoint(influencing_vars):
+            dc.add(idx)
+        if holds:
+            vc.add(idx)
+    return ic, dc, vc
+
+
+# Precondition index of each redundancy type in `_build_spec`
+# (index 0 is the necessary `N >= 0`), in report order.
+_TYPE_INDEX = {"independency": 3, "implication": 1, "range": 2}
+_DETECTORS = ("ic", "dc", "vc")
+
+
+def _detect_program(
+    bounds: tuple[int, int, int, int], *, influencing_vars: frozenset[str]
+) -> dict[str, set[int]]:
+    """Runs the three detectors on one benchmark program.
+
+    Returns the indices each detector flags as redundant, keyed by detector.
+    """
+    n_min, n_max, m_min, m_max = bounds
+    spec = _build_spec(n_min=n_min, n_max=n_max, m_min=m_min, m_max=m_max)
+    program = spec["program"]
+    pre: list[str] = list(spec["pre"])
+    post: list[str] = list(spec["post"])
+    input_ranges: dict[str, dict[str, int]] = dict(spec["inputs"])
+    step_limit = int(spec.get("step_limit", 10000))
+
+    ic, dc, vc = _detect_all(
+        program=program,
+        pre=pre,
+        post=post,
+        input_ranges=input_ranges,
+        step_limit=step_limit,
+        influencing_vars=influencing_vars,
+    )
+    return {"ic": ic, "dc": dc, "vc": vc}
+
+
+def run_simulation(
+    *, num_programs: int, seed: int, jobs: int | None = None
+) -> dict[str, Any]:
+    """Runs the synthetic benchmark and returns a JSON-serializable report.
+
+    The programs are independent, so they are spread across `jobs` worker
+    processes (default: all CPUs; 1 runs them sequentially). Their bounds are
+    still drawn from a single `seed`-driven stream, so the report does not
+    depend on `jobs`.
+    """
     rng = random.Random(seed)
 
-    totals = {
-        "true": {"independency": 0, "implication": 0, "range": 0},
-        "ic": {"independency": 0, "implication": 0, "range": 0},
-        "dc": {"independency": 0, "implication": 0, "range": 0},
-        "vc": {"independency": 0, "implication": 0, "range": 0},
-    }
-
-    for i in range(num_programs):
-        # Keep implication condition strictly weaker than `N >= 0` by choosing n_min < 0.
-        # (If n_min == 0, the "implication" precondition becomes a duplicate, which
-        # breaks the intended interpretation of "exactly one necessary precondition".)
-        n_min = rng.choice([-5, -4, -3, -2, -1])
-        n_max = rng.choice([6, 7, 8, 9, 10])
-        m_min = rng.choice([-5, -4, -3])
-        m_max = rng.choice([3, 4, 5])
-
-        spec = _build_spec(n_min=n_min, n_max=n_max, m_min=m_min, m_max=m_max)
-        program = spec["program"]
-        pre: list[str] = list(spec["pre"])
-        post: list[str] = list(spec["post"])
-        input_ranges: dict[str, dict[str, int]] = dict(spec["inputs"])
-        step_limit = int(spec.get("step_limit", 10000))
-
-        # Indices:
-        # 0: necessary, 1: implication redundant, 2: range redundant, 3: independency redundant
-        true_types = {1: "implication", 2: "range", 3: "independency"}
-        for t in true_types.values():
-            totals["true"][t] += 1
-
-        ic = _ic_like_detected(pre=pre, input_ranges=input_ranges)
-        dc = _dc_like_detected(program=program, pre=pre, post=post)
-        vc = _vc_detected(
-            program=program,
-            pre=pre,
-            post=post,
-            input_ranges=input_ranges,
-            step_limit=step_limit,
-        )
-
-        for idx, t in true_types.items():
-            if idx in ic:
-                totals["ic"][t] += 1
-            if idx in dc:
-                totals["dc"][t] += 1
-            if idx in vc:
-                totals["vc"][t] += 1
+    # The program and postcondition are the same for every spec, so the DC
+    # dependency analysis only needs to run once.
+    influencing_vars = _dependency_sources_for_post(program=_SUB_PROGRAM, post=_SUB_POST)
+
+    # Draw every program's bounds up front, one column at a time.
+    # Keep implication condition strictly weaker than `N >= 0` by choosing n_min < 0.
+    # (If n_min == 0, the "implication" precondition becomes a duplicate, which
+    # breaks the intended interpretation of "exactly one necessary precondition".)
+    n_mins = rng.choices([-5, -4, -3, -2, -1], k=num_programs)
+    n_maxs = rng.choices([6, 7, 8, 9, 10], k=num_programs)
+    m_mins = rng.choices([-5, -4, -3], k=num_programs)
+    m_maxs = rng.choices([3, 4, 5], k=num_programs)
+    bounds = list(zip(n_mins, n_maxs, m_mins, m_maxs))
+
+    detect = functools.partial(_detect_program, influencing_vars=influencing_vars)
+    with redundancy_checker.process_pool(jobs) as executor:
+        if executor is None or num_programs <= 1:
+            detections = list(map(detect, bounds))
+        else:
+            workers = jobs if jobs is not None else (os.cpu_count() or 1)
+            chunksize = max(1, num_programs // (4 * workers))
+            detections = list(executor.map(detect, bounds, chunksize=chunksize))
+
+    # Flat row-major counts: one row per detector in `_DETECTORS`, one column per
+    # redundancy type in `_TYPE_INDEX`. Every program has exactly one
+    # precondition of each type, so the "true" row is just `num_programs`.
+    width = len(_TYPE_INDEX)
+    counts = [0] * (len(_DETECTORS) * width)
+    for detected in detections:
+        for row, detector in enumerate(_DETECTORS):
+            found = detected[detector]
+            for col, idx in enumerate(_TYPE_INDEX.values(), start=row * width):
+                if idx in found:
+                    counts[col] += 1
+
+    totals = {"true": dict.fromkeys(_TYPE_INDEX, num_programs)}
+    for row, detector in enumerate(_DETECTORS):
+        totals[detector] = dict(zip(_TYPE_INDEX, counts[row * width : (row + 1) * width]))
 
     return {
         "num_programs": num_programs,
@@ -276,21 +395,25 @@ def write_outputs(
     json_path.parent.mkdir(parents=True, exist_ok=True)
     text_path.parent.mkdir(parents=True, exist_ok=True)
 
-    json_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    json_path.write_bytes(json_io.dumps_pretty(report))
 
     t = report["totals"]
-    lines = [
-        f"Programs: {report['num_programs']}",
-        f"Seed: {report['seed']}",
-        "",
-        "Detected redundant preconditions (count of true redundant of each type):",
-        "",
-        "type           true   IC-like   DC-like   VC(semantic)",
-        f"independency   {t['true']['independency']:>4}   {t['ic']['independency']:>7}   {t['dc']['independency']:>7}   {t['vc']['independency']:>11}",
-        f"implication    {t['true']['implication']:>4}   {t['ic']['implication']:>7}   {t['dc']['implication']:>7}   {t['vc']['implication']:>11}",
-        f"range          {t['true']['range']:>4}   {t['ic']['range']:>7}   {t['dc']['range']:>7}   {t['vc']['range']:>11}",
-        "",
-        f"total          {sum(t['true'].values()):>4}   {sum(t['ic'].values()):>7}   {sum(t['dc'].values()):>7}   {sum(t['vc'].values()):>11}",
-        "",
-    ]
-    text_path.write_text("\n".join(lines), encoding="utf-8")
+    true, ic, dc, vc = t["true"], t["ic"], t["dc"], t["vc"]
+    text_path.write_text(
+        f"Programs: {report['num_programs']}\n"
+        f"Seed: {report['seed']}\n"
+        "\n"
+        "Detected redundant preconditions (count of true redundant of each type):\n"
+        "\n"
+        "type           true   IC-like   DC-like   VC(semantic)\n"
+        f"independency   {true['independency']:>4}   {ic['independency']:>7}   "
+        f"{dc['independency']:>7}   {vc['independency']:>11}\n"
+        f"implication    {true['implication']:>4}   {ic['implication']:>7}   "
+        f"{dc['implication']:>7}   {vc['implication']:>11}\n"
+        f"range          {true['range']:>4}   {ic['range']:>7}   "
+        f"{dc['range']:>7}   {vc['range']:>11}\n"
+        "\n"
+        f"total          {sum(true.values()):>4}   {sum(ic.values()):>7}   "
+        f"{sum(dc.values()):>7}   {sum(vc.values()):>11}\n",
+        encoding="utf-8",
+    )
@@ -0,0 +1,57 @@
+"""GitHub API helpers shared by the installers under tools/."""
+
+from __future__ import annotations
+
+import json
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+
+def http_get_json(
+    url: str,
+    *,
+    opener: urllib.request.OpenerDirector,
+    cache_path: Path | None = None,
+) -> dict:
+    """GETs a GitHub API JSON document through `opener`.
+
+    With a `cache_path`, the response ETag and body are kept there and sent
+    back as `If-None-Match`; a 304 reply then reuses the cached body, which
+    GitHub does not count against the API rate limit.
+    """
+    headers = {"Accept": "application/vnd.github+json"}
+    cached = _read_etag_cache(cache_path)
+    if cached is not None:
+        headers["If-None-Match"] = cached["etag"]
+    req = urllib.request.Request(url, headers=headers)
+    try:
+        with opener.open(req, timeout=60) as resp:
+            body = resp.read().decode("utf-8")
+            etag = resp.headers.get("ETag")
+    except urllib.error.HTTPError as e:
+        if e.code == 304 and cached is not None:
+            return json.loads(cached["body"])
+        raise
+    if cache_path is not None and etag:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(
+            json.dumps({"etag": etag, "body": body}), encoding="utf-8"
+        )
+    return json.loads(body)
+
+
+def _read_etag_cache(cache_path: Path | None) -> dict[str, str] | None:
+    if cache_path is None or not cache_path.is_file():
+        return None
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None  # unreadable cache: just refetch
+    if not isinstance(cached, dict):
+        return None
+    if not isinstance(cached.get("etag"), str) or not isinstance(
+        cached.get("body"), str
+    ):
+        return None
+    return cached
@@ -24,6 +24,7 @@ _REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(_REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(_REPO_ROOT))
 
+from fm_project import json_io  # pylint: disable=wrong-import-position
 from fm_project import redundancy_checker  # pylint: disable=wrong-import-position
 
 
@@ -62,21 +63,47 @@ class _Scenario:
 
 def _write_json(path: Path, obj: JsonObject) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
+    path.write_bytes(json_io.dumps_pretty(obj))
+
+
+# Bounded-run results keyed by the canonical JSON of everything that affects
+# them. Many generated specs differ only in names/labels or repeat exactly, so
+# the same contract would otherwise be enumerated again and again.
+_validate_cache: dict[str, tuple[int, int]] = {}
 
 
 def _validate_spec(spec: JsonObject) -> None:
-    result = redundancy_checker.run_contract(
-        program=list(spec["program"]),
-        pre=list(spec.get("pre", [])),
-        post=list(spec.get("post", [])),
-        input_ranges=dict(spec["inputs"]),
-        step_limit=int(spec.get("step_limit", 10000)),
+    program = spec["program"]
+    pre = spec.get("pre", [])
+    post = spec.get("post", [])
+    input_ranges = spec["inputs"]
+    step_limit = int(spec.get("step_limit", 10000))
+    key = json.dumps(
+        {
+            "program": program,
+            "pre": pre,
+            "post": post,
+            "inputs": input_ranges,
+            "step_limit": step_limit,
+        },
+        sort_keys=True,
     )
-    if result.violations != 0 or result.nontermination != 0:
+    outcome = _validate_cache.get(key)
+    if outcome is None:
+        result = redundancy_checker.run_contract(
+            program=program,
+            pre=pre,
+            post=post,
+            input_ranges=input_ranges,
+            step_limit=step_limit,
+        )
+        outcome = (result.violations, result.nontermination)
+        _validate_cache[key] = outcome
+    violations, nontermination = outcome
+    if violations != 0 or nontermination != 0:
         raise ValueError(
             "Generated spec is invalid under its own bounded domain: "
-            f"violations={result.violations}, nontermination={result.nontermination}"
+            f"violations={violations}, nontermination={nontermination}"
         )
 
 
@@ -560,12 +587,17 @@ def main(argv: list[str]) -> None:
         if out_path.exists() and not _FLAGS.overwrite:
             continue
 
-        spec = dict(scenario.spec)
-        spec["id"] = file_id
-        spec["expected_redundant_pre"] = list(scenario.expected_redundant_pre)
-        _write_json(out_path, spec)
+        _write_json(
+            out_path,
+            {
+                **scenario.spec,
+                "id": file_id,
+                "expected_redundant_pre": scenario.expected_redundant_pre,
+            },
+        )
         if _FLAGS.validate:
-            _validate_spec(spec)
+            # Validation only reads the spec, so it can use the scenario's own.
+            _validate_spec(scenario.spec)
 
     print(f"Wrote {len(scenarios)} examples to {out_dir}")
 
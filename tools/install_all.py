@@ -0,0 +1,40 @@
+"""Installs the Vazir fonts and the local `tectonic` binary in one go.
+
+Both installers spend most of their time on the network (GitHub API call and
+archive download), so they run concurrently on two threads; the total time is
+roughly that of the slower one instead of the sum.
+
+Usage:
+  .venv/bin/python tools/install_all.py
+"""
+
+from __future__ import annotations
+
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Allow running both as `python -m tools.install_all` and
+# as `python tools/install_all.py` from the repo root.
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from tools import install_tectonic  # pylint: disable=wrong-import-position
+from tools import install_vazir  # pylint: disable=wrong-import-position
+
+
+def install_all() -> None:
+    installers = (install_vazir.install, install_tectonic.install)
+    with ThreadPoolExecutor(max_workers=len(installers)) as pool:
+        futures = [pool.submit(installer) for installer in installers]
+        for future in futures:
+            future.result()  # re-raises the installer's error, if any
+
+
+def main() -> None:
+    install_all()
+
+
+if __name__ == "__main__":
+    main()
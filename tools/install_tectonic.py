@@ -11,42 +11,66 @@ to build using `${workspaceFolder}/tools/bin/tectonic`.
 
 from __future__ import annotations
 
-import json
 import os
-import stat
+import shutil
+import sys
 import tarfile
+import tempfile
 import urllib.request
 from pathlib import Path
 
+# Allow running both as `python -m tools.install_tectonic` and
+# as `python tools/install_tectonic.py` from the repo root.
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from tools import _github  # pylint: disable=wrong-import-position
+
 
 GITHUB_API_LATEST = (
     "https://api.github.com/repos/tectonic-typesetting/tectonic/releases/latest"
 )
 
 
-class InstallError(RuntimeError):
-    pass
+# One opener for the API call and the download, carrying the shared headers.
+_OPENER = urllib.request.build_opener()
+_OPENER.addheaders = [("User-Agent", "fm-project-tectonic-installer")]
 
 
-def _http_get_json(url: str) -> dict:
-    req = urllib.request.Request(
-        url,
-        headers={
-            "Accept": "application/vnd.github+json",
-            "User-Agent": "fm-project-tectonic-installer",
-        },
-    )
-    with urllib.request.urlopen(req, timeout=60) as resp:
-        return json.loads(resp.read().decode("utf-8"))
+class InstallError(RuntimeError):
+    pass
 
 
-def _download(url: str, dst: Path) -> None:
-    req = urllib.request.Request(
-        url,
-        headers={"User-Agent": "fm-project-tectonic-installer"},
-    )
-    with urllib.request.urlopen(req, timeout=300) as resp:
-        dst.write_bytes(resp.read())
+def _download_binary(url: str, dst: Path) -> bool:
+    """Streams the tar.gz at `url` and installs its `tectonic` binary as `dst`.
+
+    The archive is read in streaming mode (`r|gz`), so it is never stored on
+    disk or held in memory; every other member is skipped. The binary is
+    written to a temporary file next to `dst` and moved into place only once
+    complete, so a failed download leaves any existing `dst` untouched.
+    Returns False if the archive has no `tectonic` file.
+    """
+    with _OPENER.open(url, timeout=300) as resp:
+        with tarfile.open(fileobj=resp, mode="r|gz") as tf:
+            for member in tf:
+                if not member.isfile() or Path(member.name).name != "tectonic":
+                    continue
+                src = tf.extractfile(member)
+                assert src is not None  # regular files always have data
+                tmp = tempfile.NamedTemporaryFile(
+                    dir=dst.parent, prefix=".tectonic-", delete=False
+                )
+                try:
+                    with src, tmp:
+                        shutil.copyfileobj(src, tmp, 1 << 20)
+                    os.chmod(tmp.name, 0o755)
+                    os.replace(tmp.name, dst)
+                except BaseException:
+                    os.unlink(tmp.name)
+                    raise
+                return True
+    return False
 
 
 def _pick_asset(release: dict) -> tuple[str, str]:
@@ -79,27 +103,17 @@ def install() -> Path:
     bin_dir = root / "tools" / "bin"
     bin_dir.mkdir(parents=True, exist_ok=True)
 
-    release = _http_get_json(GITHUB_API_LATEST)
+    release = _github.http_get_json(
+        GITHUB_API_LATEST,
+        cache_path=bin_dir / ".gh_etag_tectonic.json",
+        opener=_OPENER,
+    )
     tag = release.get("tag_name", "unknown")
     asset_name, url = _pick_asset(release)
 
-    archive_path = Path("/tmp") / asset_name
-    _download(url, archive_path)
-
-    extracted_dir = Path("/tmp") / f"tectonic-extract-{os.getpid()}"
-    extracted_dir.mkdir(parents=True, exist_ok=True)
-    with tarfile.open(archive_path, "r:gz") as tf:
-        tf.extractall(extracted_dir)
-
-    # Find the binary inside the extracted directory.
-    binary_candidates = list(extracted_dir.rglob("tectonic"))
-    if not binary_candidates:
-        raise InstallError("Downloaded archive did not contain a `tectonic` binary.")
-
-    src = binary_candidates[0]
     dst = bin_dir / "tectonic"
-    dst.write_bytes(src.read_bytes())
-    dst.chmod(dst.stat().st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+    if not _download_binary(url, dst):
+        raise InstallError("Downloaded archive did not contain a `tectonic` binary.")
 
     print(f"Installed {dst} from {asset_name} ({tag})")
     return dst
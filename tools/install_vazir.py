@@ -10,37 +10,39 @@ Usage:
 
 from __future__ import annotations
 
-import json
-import os
+import io
+import shutil
+import sys
 import zipfile
 from pathlib import Path
-from typing import Iterable
-from urllib.request import Request, urlopen
+from urllib.request import build_opener
+
+# Allow running both as `python -m tools.install_vazir` and
+# as `python tools/install_vazir.py` from the repo root.
+_REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(_REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(_REPO_ROOT))
+
+from tools import _github  # pylint: disable=wrong-import-position
 
 
 GITHUB_API_LATEST = "https://api.github.com/repos/rastikerdar/vazir-font/releases/latest"
 
 
-class InstallError(RuntimeError):
-    pass
+# One opener for the API call and the download, carrying the shared headers.
+_OPENER = build_opener()
+_OPENER.addheaders = [("User-Agent", "fm-project-vazir-installer")]
 
 
-def _http_get_json(url: str) -> dict:
-    req = Request(
-        url,
-        headers={
-            "Accept": "application/vnd.github+json",
-            "User-Agent": "fm-project-vazir-installer",
-        },
-    )
-    with urlopen(req, timeout=60) as resp:
-        return json.loads(resp.read().decode("utf-8"))
+class InstallError(RuntimeError):
+    pass
 
 
-def _download(url: str, dst: Path) -> None:
-    req = Request(url, headers={"User-Agent": "fm-project-vazir-installer"})
-    with urlopen(req, timeout=300) as resp:
-        dst.write_bytes(resp.read())
+def _download(url: str) -> io.BytesIO:
+    # ZipFile needs a seekable file, so the archive is buffered in memory
+    # rather than written to a temporary file and read back.
+    with _OPENER.open(url, timeout=300) as resp:
+        return io.BytesIO(resp.read())
 
 
 def _pick_zip_asset(release: dict) -> tuple[str, str]:
@@ -65,38 +67,38 @@ def _pick_zip_asset(release: dict) -> tuple[str, str]:
     return candidates[0]
 
 
-def _find_first(names: Iterable[str], *, suffix: str, target_basename: str) -> str | None:
-    for n in names:
-        if not n.lower().endswith(suffix.lower()):
-            continue
-        if Path(n).name.lower() == target_basename.lower():
-            return n
-    return None
-
-
 def install() -> None:
     root = Path(__file__).resolve().parents[1]
     fonts_dir = root / "fonts"
     fonts_dir.mkdir(parents=True, exist_ok=True)
 
-    release = _http_get_json(GITHUB_API_LATEST)
+    release = _github.http_get_json(
+        GITHUB_API_LATEST,
+        cache_path=root / "tools" / "bin" / ".gh_etag_vazir-font.json",
+        opener=_OPENER,
+    )
     asset_name, url = _pick_zip_asset(release)
 
-    archive_path = Path("/tmp") / f"vazir-{os.getpid()}.zip"
-    _download(url, archive_path)
-
-    with zipfile.ZipFile(archive_path, "r") as zf:
-        names = zf.namelist()
-        regular = _find_first(names, suffix=".ttf", target_basename="Vazirmatn-Regular.ttf")
-        bold = _find_first(names, suffix=".ttf", target_basename="Vazirmatn-Bold.ttf")
+    with zipfile.ZipFile(_download(url), "r") as zf:
+        # Lower-cased basename -> first member with that name, built in one pass.
+        by_basename: dict[str, str] = {}
+        for name in zf.namelist():
+            if name.lower().endswith(".ttf"):
+                by_basename.setdefault(Path(name).name.lower(), name)
+        regular = by_basename.get("vazirmatn-regular.ttf")
+        bold = by_basename.get("vazirmatn-bold.ttf")
 
         if regular is None or bold is None:
             raise InstallError(
                 "Could not locate Vazirmatn-Regular.ttf and Vazirmatn-Bold.ttf in downloaded zip."
             )
 
-        (fonts_dir / "Vazirmatn-Regular.ttf").write_bytes(zf.read(regular))
-        (fonts_dir / "Vazirmatn-Bold.ttf").write_bytes(zf.read(bold))
+        for member, target in (
+            (regular, "Vazirmatn-Regular.ttf"),
+            (bold, "Vazirmatn-Bold.ttf"),
+        ):
+            with zf.open(member) as src, (fonts_dir / target).open("wb") as dst:
+                shutil.copyfileobj(src, dst, 1 << 16)
 
     print("Installed fonts/Vazirmatn-Regular.ttf and fonts/Vazirmatn-Bold.ttf")
 
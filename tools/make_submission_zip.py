@@ -2,8 +2,13 @@
 
 from __future__ import annotations
 
+import collections
+import itertools
+import os
+import posixpath
 import sys
 import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
 
@@ -27,10 +32,12 @@ INCLUDE_PATHS = [
     "fm_project/cli.py",
     "fm_project/redundancy_checker.py",
     "fm_project/simulation.py",
+    "fm_project/json_io.py",
     "fm_project/group_redundancy.py",
     "make_submission_zip.py",
     "tools/make_submission_zip.py",
     "tools/install_vazir.py",
+    "tools/_github.py",
     "tools/generate_examples.py",
     "tools/summarize_generated_examples.py",
     "examples/sub.json",
@@ -49,18 +56,63 @@ INCLUDE_PATHS = [
 ]
 
 
-def _iter_files_to_zip(root: Path, rel_path: str) -> list[tuple[Path, str]]:
+# Files read ahead of the zip writer; bounds memory to a few files' contents.
+_READ_AHEAD = 4
+
+# Formats that are already compressed; deflating them again costs CPU and
+# rarely saves any space, so they are stored as-is.
+_STORED_SUFFIXES = frozenset({".pdf", ".ttf", ".zip", ".png", ".jpg", ".jpeg"})
+
+
+def _compress_type(arcname: str) -> int:
+    if Path(arcname).suffix.lower() in _STORED_SUFFIXES:
+        return zipfile.ZIP_STORED
+    return zipfile.ZIP_DEFLATED
+
+
+def _scan_entries(root: Path, rel_paths: list[str]) -> dict[str, bool]:
+    """Maps existing `rel_paths` to whether each is a directory.
+
+    Lists each distinct parent directory once with `os.scandir` instead of
+    stat-ing every path separately. Paths that are neither a file nor a
+    directory (e.g. broken symlinks) count as missing, like `Path.exists`.
+    """
+    wanted = set(rel_paths)
+    kinds: dict[str, bool] = {}
+    for parent in sorted({posixpath.dirname(p) for p in wanted}):
+        try:
+            with os.scandir(root / parent) as it:
+                for entry in it:
+                    rel = posixpath.join(parent, entry.name)
+                    if rel not in wanted:
+                        continue
+                    if entry.is_dir():
+                        kinds[rel] = True
+                    elif entry.is_file():
+                        kinds[rel] = False
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+    return kinds
+
+
+def _iter_files_to_zip(
+    root: Path, rel_path: str, *, is_dir: bool
+) -> list[tuple[Path, str]]:
     """Returns (absolute_path, archive_name) pairs for a file or directory."""
     abs_path = root / rel_path
-    if abs_path.is_file():
+    if not is_dir:
         return [(abs_path, rel_path)]
-    if abs_path.is_dir():
-        pairs: list[tuple[Path, str]] = []
-        for file_path in sorted(p for p in abs_path.rglob("*") if p.is_file()):
-            arcname = str(file_path.relative_to(root))
-            pairs.append((file_path, arcname))
-        return pairs
-    return []
+    pairs: list[tuple[Path, str]] = []
+    for file_path in sorted(p for p in abs_path.rglob("*") if p.is_file()):
+        arcname = str(file_path.relative_to(root))
+        pairs.append((file_path, arcname))
+    return pairs
+
+
+def _read_entry(pair: tuple[Path, str]) -> tuple[zipfile.ZipInfo, bytes]:
+    """Returns the zip entry header (name, mtime, mode) and contents of a file."""
+    abs_path, arcname = pair
+    return zipfile.ZipInfo.from_file(abs_path, arcname=arcname), abs_path.read_bytes()
 
 
 def main(argv: list[str]) -> int:
@@ -86,17 +138,42 @@ def main(argv: list[str]) -> int:
     root = Path(".").resolve()
     zip_path = root / zip_name
 
-    missing = [p for p in INCLUDE_PATHS if not (root / p).exists()]
+    include_paths = list(dict.fromkeys(INCLUDE_PATHS))  # ordered, without repeats
+    kinds = _scan_entries(root, include_paths)
+    missing = [p for p in include_paths if p not in kinds]
     if missing:
         print("Missing required files:", file=sys.stderr)
         for p in missing:
             print(f"- {p}", file=sys.stderr)
         return 1
 
+    # A file can be reached twice (listed on its own and inside a listed
+    # directory); zipfile would store it twice, so keep only the first.
+    entries: list[tuple[Path, str]] = []
+    seen: set[str] = set()
+    for rel in include_paths:
+        for abs_path, arcname in _iter_files_to_zip(root, rel, is_dir=kinds[rel]):
+            if arcname in seen:
+                print(f"Skipping duplicate entry: {arcname}", file=sys.stderr)
+                continue
+            seen.add(arcname)
+            entries.append((abs_path, arcname))
     with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-        for rel in INCLUDE_PATHS:
-            for abs_path, arcname in _iter_files_to_zip(root, rel):
-                zf.write(abs_path, arcname=arcname)
+        # zipfile has a single output stream, so entries are compressed and
+        # written in order on this thread; the worker threads read the next
+        # few files meanwhile (zlib releases the GIL while it deflates).
+        todo = iter(entries)
+        with ThreadPoolExecutor(max_workers=_READ_AHEAD) as pool:
+            pending: collections.deque[Future[tuple[zipfile.ZipInfo, bytes]]]
+            pending = collections.deque(
+                pool.submit(_read_entry, e) for e in itertools.islice(todo, _READ_AHEAD)
+            )
+            while pending:
+                info, data = pending.popleft().result()
+                nxt = next(todo, None)
+                if nxt is not None:
+                    pending.append(pool.submit(_read_entry, nxt))
+                zf.writestr(info, data, compress_type=_compress_type(info.filename))
 
     print(zip_name)
     return 0
@@ -10,7 +10,10 @@ final report without dumping per-example traces.
 
 from __future__ import annotations
 
-import json
+import dataclasses
+import hashlib
+import os
+import pickle
 import sys
 from dataclasses import dataclass
 from pathlib import Path
@@ -25,6 +28,7 @@ _REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(_REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(_REPO_ROOT))
 
+from fm_project import json_io  # pylint: disable=wrong-import-position
 from fm_project import redundancy_checker  # pylint: disable=wrong-import-position
 
 
@@ -50,6 +54,22 @@ flags.DEFINE_string(
     "outputs/generated_examples_summary.txt",
     "Path for human-readable output.",
 )
+flags.DEFINE_string(
+    "cache",
+    "outputs/.summarize_cache.pkl",
+    (
+        "Pickle cache of per-example results, reused for example files whose "
+        "mtime and size are unchanged (empty disables it)."
+    ),
+)
+flags.DEFINE_integer(
+    "jobs",
+    None,
+    (
+        "Worker processes for analyzing examples "
+        "(default: all CPUs; 1 runs them sequentially)."
+    ),
+)
 
 
 JsonObject = dict[str, Any]
@@ -63,8 +83,37 @@ class _ExampleCounts:
     ic_implied: int
 
 
+# Cached results are (mtime_ns, size, astuple(_ExampleCounts)) per example path.
+_CacheEntries = dict[str, tuple[int, int, tuple[int, ...]]]
+
+
+def _cache_version() -> str:
+    """Fingerprints the code the cached results depend on."""
+    digest = hashlib.sha256()
+    for source in (Path(redundancy_checker.__file__), Path(__file__)):
+        digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def _load_cache(path: Path, version: str) -> _CacheEntries:
+    try:
+        with path.open("rb") as f:
+            cache = pickle.load(f)
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ValueError):
+        return {}  # missing or unreadable: start over
+    if not isinstance(cache, dict) or cache.get("version") != version:
+        return {}
+    return cache["examples"]
+
+
+def _save_cache(path: Path, version: str, entries: _CacheEntries) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("wb") as f:
+        pickle.dump({"version": version, "examples": entries}, f)
+
+
 def _load_spec(path: Path) -> JsonObject:
-    return json.loads(path.read_text(encoding="utf-8"))
+    return json_io.loads(path.read_bytes())
 
 
 def _analyze_one(path: Path) -> _ExampleCounts:
@@ -75,28 +124,39 @@ def _analyze_one(path: Path) -> _ExampleCounts:
     input_ranges = dict(spec["inputs"])
     step_limit = int(spec.get("step_limit", 10000))
 
+    # IC first: dropping a precondition the others imply leaves the accepted
+    # inputs unchanged, so when the full contract holds it is redundant without
+    # another contract run. Only the remaining indices need the VC check.
+    implied = redundancy_checker.implies_bounded_batch(
+        pre=pre, input_ranges=input_ranges
+    )
+    implied_indices = {idx for idx, ok in enumerate(implied) if ok}
+
     redundant_indices: set[int] = set()
-    for idx in range(len(pre)):
-        reduced = [x for j, x in enumerate(pre) if j != idx]
-        rr = redundancy_checker.run_contract(
+    if implied_indices:
+        base = redundancy_checker.run_contract(
             program=program,
-            pre=reduced,
+            pre=pre,
             post=post,
             input_ranges=input_ranges,
             step_limit=step_limit,
         )
-        if rr.violations == 0 and rr.nontermination == 0:
-            redundant_indices.add(idx)
-
-    implied_indices: set[int] = set()
-    for idx, p in enumerate(pre):
-        others = [x for j, x in enumerate(pre) if j != idx]
-        if redundancy_checker.implies_bounded(
-            antecedent=others,
-            consequent=p,
-            input_ranges=input_ranges,
-        ):
-            implied_indices.add(idx)
+        if base.violations == 0 and base.nontermination == 0:
+            redundant_indices |= implied_indices
+    to_check = [idx for idx in range(len(pre)) if idx not in redundant_indices]
+    reduced_runs = redundancy_checker.run_contract_batch(
+        program=program,
+        pre=pre,
+        post=post,
+        input_ranges=input_ranges,
+        step_limit=step_limit,
+        drop_indices=to_check,
+    )
+    redundant_indices.update(
+        idx
+        for idx, rr in zip(to_check, reduced_runs)
+        if rr.violations == 0 and rr.nontermination == 0
+    )
 
     redundant = len(redundant_indices)
     needed = len(pre) - redundant
@@ -108,47 +168,102 @@ def _analyze_one(path: Path) -> _ExampleCounts:
     )
 
 
-def _mean(values: list[int]) -> float:
-    if not values:
-        return 0.0
-    return float(sum(values)) / float(len(values))
+def _list_examples(examples_dir: Path) -> list[Path]:
+    """Returns the `ex_*.json` files in `examples_dir`, sorted by name.
+
+    `os.scandir` reports the entry types with the listing, so this needs no
+    extra stat per file (unless an entry is a symlink).
+    """
+    try:
+        with os.scandir(examples_dir) as it:
+            names = [
+                e.name
+                for e in it
+                if e.name.startswith("ex_") and e.name.endswith(".json") and e.is_file()
+            ]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+    return [examples_dir / name for name in sorted(names)]
 
 
 def main(argv: list[str]) -> None:
     del argv  # unused (absl handles flags)
 
     examples_dir = Path(_FLAGS.examples_dir)
-    paths = sorted(p for p in examples_dir.glob("ex_*.json") if p.is_file())
+    paths = _list_examples(examples_dir)
     if int(_FLAGS.limit) > 0:
         paths = paths[: int(_FLAGS.limit)]
 
     if not paths:
         raise app.UsageError(f"No examples found under {examples_dir}")
 
-    counts: list[_ExampleCounts] = []
-    for p in paths:
-        counts.append(_analyze_one(p))
-
-    num_pre = [c.num_pre for c in counts]
-    needed = [c.needed for c in counts]
-    redundant = [c.redundant for c in counts]
-    implied = [c.ic_implied for c in counts]
-
+    cache_path = Path(_FLAGS.cache) if _FLAGS.cache else None
+    version = _cache_version()
+    cached = _load_cache(cache_path, version) if cache_path is not None else {}
+    # Stat before analyzing, so an edit made meanwhile invalidates the entry.
+    stats = {p: p.stat() for p in paths}
+    found: dict[Path, _ExampleCounts] = {}
+    for p, st in stats.items():
+        entry = cached.get(str(p))
+        if entry is not None and entry[:2] == (st.st_mtime_ns, st.st_size):
+            found[p] = _ExampleCounts(*entry[2])
+    stale = [p for p in paths if p not in found]
+
+    # Examples are independent and CPU-bound, so they are spread across processes.
+    with redundancy_checker.process_pool(_FLAGS.jobs) as executor:
+        if executor is None or len(stale) <= 1:
+            fresh = [_analyze_one(p) for p in stale]
+        else:
+            fresh = list(executor.map(_analyze_one, stale, chunksize=8))
+    for p, c in zip(stale, fresh):
+        found[p] = c
+        st = stats[p]
+        cached[str(p)] = (st.st_mtime_ns, st.st_size, dataclasses.astuple(c))
+    if cache_path is not None:
+        # Keep only this run's examples, so entries for deleted files or other
+        # example directories do not accumulate.
+        current = {str(p): cached[str(p)] for p in paths}
+        if stale or len(current) != len(cached):
+            _save_cache(cache_path, version, current)
+    counts = [found[p] for p in paths]
+
+    # One pass over the counts for every statistic.
+    first = counts[0]
+    sum_pre = sum_needed = sum_redundant = sum_implied = 0
+    min_pre = max_pre = first.num_pre
+    min_needed = max_needed = first.needed
+    min_redundant = max_redundant = first.redundant
+    all_redundant = 0
+    for c in counts:
+        sum_pre += c.num_pre
+        sum_needed += c.needed
+        sum_redundant += c.redundant
+        sum_implied += c.ic_implied
+        min_pre = min(min_pre, c.num_pre)
+        max_pre = max(max_pre, c.num_pre)
+        min_needed = min(min_needed, c.needed)
+        max_needed = max(max_needed, c.needed)
+        min_redundant = min(min_redundant, c.redundant)
+        max_redundant = max(max_redundant, c.redundant)
+        if c.needed == 0:
+            all_redundant += 1
+
+    n = len(counts)
     summary: JsonObject = {
         "examples_dir": str(examples_dir),
-        "num_examples": len(counts),
-        "avg_pre": _mean(num_pre),
-        "avg_needed": _mean(needed),
-        "avg_redundant": _mean(redundant),
-        "avg_ic_implied": _mean(implied),
-        "count_all_pre_redundant": sum(1 for c in counts if c.needed == 0),
-        "count_has_needed_pre": sum(1 for c in counts if c.needed > 0),
-        "min_pre": min(num_pre),
-        "max_pre": max(num_pre),
-        "min_needed": min(needed),
-        "max_needed": max(needed),
-        "min_redundant": min(redundant),
-        "max_redundant": max(redundant),
+        "num_examples": n,
+        "avg_pre": sum_pre / n,
+        "avg_needed": sum_needed / n,
+        "avg_redundant": sum_redundant / n,
+        "avg_ic_implied": sum_implied / n,
+        "count_all_pre_redundant": all_redundant,
+        "count_has_needed_pre": n - all_redundant,  # needed is never negative
+        "min_pre": min_pre,
+        "max_pre": max_pre,
+        "min_needed": min_needed,
+        "max_needed": max_needed,
+        "min_redundant": min_redundant,
+        "max_redundant": max_redundant,
     }
 
     out_json = Path(_FLAGS.out_json)
@@ -156,7 +271,7 @@ def main(argv: list[str]) -> None:
     out_json.parent.mkdir(parents=True, exist_ok=True)
     out_txt.parent.mkdir(parents=True, exist_ok=True)
 
-    out_json.write_text(json.dumps(summary, ensure_ascii=False, indent=2), encoding="utf-8")
+    out_json.write_bytes(json_io.dumps_pretty(summary))
 
     lines = [
         f"Generated examples dir: {examples_dir}",